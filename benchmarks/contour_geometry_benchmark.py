@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# @Author: Diogo Telheiro do Nascimento
+# @Date:   2022-06-18 20:01:57
+# @Last Modified by:   Diogo Telheiro do Nascimento
+# @Last Modified time: 2022-06-20 17:52:36
+
+import time
+import argparse
+import cv2
+import numpy as np
+from models.genericTransformations import GenericTransformations
+
+
+def per_contour_geometry(cnts: list) -> dict:
+    """Contour geometry computed one contour at a time, as the transformations used to do."""
+    moments = [cv2.moments(cnt) for cnt in cnts]
+    return {
+        'areas': np.asarray([cv2.contourArea(cnt) for cnt in cnts]),
+        'perimeters': np.asarray([cv2.arcLength(cnt, True) for cnt in cnts]),
+        'rects': np.asarray([cv2.boundingRect(cnt) for cnt in cnts]),
+        'centroids': np.asarray([(m['m10'] / m['m00'], m['m01'] / m['m00']) if m['m00'] else (np.nan, np.nan) for m in moments]),
+        'sorted': sorted(cnts, key=lambda x: x.min(axis=0).flatten()[0])
+    }
+
+
+def batch_geometry(cnts: list) -> dict:
+    """Contour geometry computed for all contours at once."""
+    geometry = GenericTransformations.contour_geometry(cnts)
+    return {
+        'areas': geometry.areas,
+        'perimeters': geometry.perimeters,
+        'rects': geometry.rects,
+        'centroids': geometry.centroids,
+        'sorted': geometry.order(geometry.min_positions[:, 0]).contours
+    }
+
+
+def best_time(func, cnts: list, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(cnts)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+    
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Compare per-contour and batch contour geometry on frames with many contours.')
+    ap.add_argument('-s', '--sizes', nargs='+', type=int, default=[400, 800, 1600, 3200], help='Frame widths (4:3) of the random frames. Larger frames yield more contours.')
+    ap.add_argument('-r', '--repeat', type=int, default=5, help='Number of repetitions, the best time is reported.')
+    args = vars(ap.parse_args())
+
+    rng = np.random.default_rng(0)
+    print(f"{'contours':>10} {'per-contour (ms)':>18} {'batch (ms)':>12} {'speedup':>9}")
+    for width in args['sizes']:
+        noise = (rng.random((width * 3 // 4, width)) > 0.7).astype(np.uint8) * 255
+        noise = cv2.morphologyEx(noise, cv2.MORPH_OPEN, np.ones((2, 2), np.uint8))
+        cnts, _ = cv2.findContours(noise, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+        expected, result = per_contour_geometry(cnts), batch_geometry(cnts)
+        valid = ~np.isnan(expected['centroids'][:, 0])
+        assert np.allclose(expected['areas'], result['areas']) and np.allclose(expected['perimeters'], result['perimeters'])
+        assert (expected['rects'] == result['rects']).all() and np.allclose(expected['centroids'][valid], result['centroids'][valid])
+        assert all(a is b for a, b in zip(expected['sorted'], result['sorted']))
+
+        per_contour_time = best_time(per_contour_geometry, cnts, args['repeat'])
+        batch_time = best_time(batch_geometry, cnts, args['repeat'])
+        print(f"{len(cnts):>10} {per_contour_time * 1000:>18.2f} {batch_time * 1000:>12.2f} {per_contour_time / batch_time:>8.1f}x")
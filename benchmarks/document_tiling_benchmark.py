@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# @Author: Diogo Telheiro do Nascimento
+# @Date:   2022-06-18 20:01:57
+# @Last Modified by:   Diogo Telheiro do Nascimento
+# @Last Modified time: 2022-06-20 17:52:36
+
+import os
+import time
+import argparse
+import cv2
+import numpy as np
+from models import DocumentScannerImageTransformation
+
+
+def synthetic_scan(width: int, height: int, seed: int=0) -> tuple:
+    """Dark background with a slightly rotated page covered by text-like strokes.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: BGR scan and the page corners (top-left, top-right, bottom-right, bottom-left).
+    """        
+    rng = np.random.default_rng(seed)
+    scan = np.full((height, width, 3), 40, dtype=np.uint8)
+    margin_x, margin_y = width // 20, height // 20
+    corners = np.float32([[margin_x, margin_y + height // 100], [width - margin_x, margin_y], 
+                          [width - margin_x - width // 100, height - margin_y], [margin_x, height - margin_y]])
+    cv2.fillConvexPoly(scan, corners.astype(np.int32), (235, 235, 235))
+    for y in range(2 * margin_y, height - 2 * margin_y, max(height // 150, 4)):
+        for x in range(2 * margin_x, width - 2 * margin_x, max(width // 80, 4)):
+            if rng.random() < 0.8:
+                cv2.rectangle(scan, (x, y), (x + int(rng.integers(2, max(width // 90, 3))), y + max(height // 300, 2)), (30, 30, 30), -1)
+    return cv2.GaussianBlur(scan, (3, 3), 0), corners
+
+
+def best_time(func, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), output
+
+    
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Scaling of the document warping and binarization of large scans against the number of threads.')
+    ap.add_argument('-W', '--width', type=int, default=5100, help='Scan width. 5100x7020 is an A4 page at 600 dpi.')
+    ap.add_argument('-H', '--height', type=int, default=7020, help='Scan height.')
+    ap.add_argument('-s', '--strip_height', type=int, default=512, help='Rows of each binarization strip.')
+    ap.add_argument('-t', '--threads', nargs='+', type=int, default=None, help='Thread counts. Defaults to powers of two up to the number of cores.')
+    ap.add_argument('-r', '--repeat', type=int, default=3, help='Number of repetitions, the best time is reported.')
+    args = vars(ap.parse_args())
+
+    cores = os.cpu_count()
+    thread_counts = args['threads'] or sorted({2 ** i for i in range(int(np.log2(cores)) + 1)} | {cores})
+    scan, corners = synthetic_scan(args['width'], args['height'])
+
+    cv2.setNumThreads(1)
+    single = DocumentScannerImageTransformation()
+    single._int_points = corners
+    warp_time, page = best_time(lambda: single._generate_perspective_transformation(scan), args['repeat'])
+    binarization_time, expected_binary = best_time(lambda: single._apply_document_threshold_binarization(page), args['repeat'])
+
+    print(f"{cores} cores, page {page.shape[1]}x{page.shape[0]}, binarization strips of {args['strip_height']} rows")
+    print("Warping runs on OpenCV threads (cv2.setNumThreads), binarization strips on a thread pool with a single OpenCV thread.")
+    print(f"{'threads':>8} {'warp (ms)':>10} {'speedup':>8} {'binarize (ms)':>14} {'speedup':>8} {'identical':>10}")
+    print(f"{'single':>8} {warp_time * 1000:>10.1f} {'':>8} {binarization_time * 1000:>14.1f} {'':>8} {'':>10}")
+    for n_threads in thread_counts:
+        cv2.setNumThreads(n_threads)
+        threaded_warp_time, warp = best_time(lambda: single._generate_perspective_transformation(scan), args['repeat'])
+        cv2.setNumThreads(1)
+        tiled = DocumentScannerImageTransformation(strip_height=args['strip_height'], n_threads=n_threads)
+        tiled_binarization_time, binary = best_time(lambda: tiled._apply_document_threshold_binarization(page), args['repeat'])
+        identical = np.array_equal(warp, page) and np.array_equal(binary, expected_binary)
+        print(f"{n_threads:>8} {threaded_warp_time * 1000:>10.1f} {warp_time / threaded_warp_time:>7.2f}x "
+              f"{tiled_binarization_time * 1000:>14.1f} {binarization_time / tiled_binarization_time:>7.2f}x {str(identical):>10}")
\ No newline at end of file
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# @Author: Diogo Telheiro do Nascimento
+# @Date:   2022-06-18 20:01:57
+# @Last Modified by:   Diogo Telheiro do Nascimento
+# @Last Modified time: 2022-06-20 17:52:36
+
+import time
+import argparse
+import numpy as np
+from models import DlibLandmarkDetectorImageTransformation, CaffeDetectorImageTransformation, CascadedFaceLandmarkImageTransformation
+from controller.frameStore import open_video_source
+
+LEFT_EYE_CORNER, RIGHT_EYE_CORNER = 36, 45
+
+
+def match_faces(reference: np.ndarray, landmarks: np.ndarray, max_error: float=0.5) -> np.ndarray:
+    """Normalized error of the faces found by both pipelines.
+    Faces are matched greedily by the distance of their landmark centers, and the mean landmark distance is normalized by
+    the inter-ocular distance of the reference face (NME).
+
+    Args:
+        reference (np.ndarray): (faces, 68, 2) landmarks of the reference pipeline.
+        landmarks (np.ndarray): (faces, 68, 2) landmarks of the compared pipeline.
+        max_error (float, optional): Matches with a larger NME are considered different faces. Defaults to 0.5.
+
+    Returns:
+        np.ndarray: NME of each matched face.
+    """
+    if not len(reference) or not len(landmarks):
+        return np.zeros(0)
+    interocular = np.linalg.norm(reference[:, LEFT_EYE_CORNER] - reference[:, RIGHT_EYE_CORNER], axis=1)
+    errors = np.linalg.norm(reference[:, None].astype(float) - landmarks[None], axis=-1).mean(axis=-1) / interocular[:, None]
+    matched = []
+    while errors.size and errors.min() <= max_error:
+        i, j = np.unravel_index(np.argmin(errors), errors.shape)
+        matched.append(errors[i, j])
+        errors[i, :], errors[:, j] = np.inf, np.inf
+    return np.asarray(matched)
+
+
+def run(transformation: DlibLandmarkDetectorImageTransformation, frame: np.ndarray, detector_argument) -> tuple:
+    start = time.perf_counter()
+    landmarks = transformation.predict_landmarks(frame, detector_argument)
+    return landmarks, time.perf_counter() - start
+
+    
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Compare the Dlib HOG face finder against the Caffe DNN face finder of the Dlib shape predictor.')
+    ap.add_argument('-m', '--model', type=str, default='./resource/shape_predictor_68_face_landmarks.dat', help='Path to the shape predictor weights')
+    ap.add_argument('-p', '--prototxt', type=str, default='./resource/deploy.prototxt', help='Path to the Caffe face detector prototxt file')
+    ap.add_argument('--face_model', type=str, default='./resource/opencv_face_detector.caffemodel', help='Path to the Caffe face detector weights')
+    ap.add_argument('-v', '--video_source', required=True, help='Video path or frame store directory with faces')
+    ap.add_argument('-u', '--num_upsamples', type=int, default=1, help='Number of upsamples of the HOG detector')
+    ap.add_argument('-c', '--confidence', type=float, default=0.5, help='Confidence of the Caffe face detector')
+    ap.add_argument('-n', '--max_frames', type=int, default=300, help='Maximum number of frames')
+    args = vars(ap.parse_args())
+
+    hog = DlibLandmarkDetectorImageTransformation(args['model'])
+    cascaded = CascadedFaceLandmarkImageTransformation(CaffeDetectorImageTransformation(args['prototxt'], args['face_model']), args['model'])
+
+    cap = open_video_source(args['video_source'])
+    timings = {'hog': [], 'caffe': []}
+    faces = {'hog': 0, 'caffe': 0}
+    errors = []
+    while len(timings['hog']) < args['max_frames']:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        hog_landmarks, hog_time = run(hog, frame, args['num_upsamples'])
+        caffe_landmarks, caffe_time = run(cascaded, frame, args['confidence'])
+        timings['hog'].append(hog_time)
+        timings['caffe'].append(caffe_time)
+        faces['hog'] += len(hog_landmarks)
+        faces['caffe'] += len(caffe_landmarks)
+        errors.extend(match_faces(hog_landmarks, caffe_landmarks))
+    cap.release()
+
+    print(f"{len(timings['hog'])} frames")
+    print(f"{'face finder':>12} {'FPS':>8} {'mean (ms)':>10} {'p95 (ms)':>9} {'faces':>7}")
+    for name, name_timings in timings.items():
+        name_timings = np.asarray(name_timings) * 1000
+        print(f"{name:>12} {1000 / name_timings.mean():>8.1f} {name_timings.mean():>10.2f} {np.percentile(name_timings, 95):>9.2f} {faces[name]:>7}")
+    if errors:
+        print(f"{len(errors)} faces found by both, landmark NME against HOG: mean {np.mean(errors):.4f}, p95 {np.percentile(errors, 95):.4f}")
\ No newline at end of file
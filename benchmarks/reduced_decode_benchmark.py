@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# @Author: Diogo Telheiro do Nascimento
+# @Date:   2022-06-18 20:01:57
+# @Last Modified by:   Diogo Telheiro do Nascimento
+# @Last Modified time: 2022-06-20 17:52:36
+
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+import cv2
+import numpy as np
+from controller.imageLoader import read_image
+
+WORKING_RESOLUTIONS = {
+    'caffe (300x300)': (300, 300),
+    'tracking (500w)': (500, 0),
+    'measure (600w)': (600, 0)
+}
+
+
+def synthetic_photo(width: int, height: int, seed: int=0) -> np.ndarray:
+    """Smooth gradients, shapes and sensor-like noise, compressing like a photo rather than like flat synthetic images."""
+    rng = np.random.default_rng(seed)
+    x, y = np.meshgrid(np.linspace(0, 1, width, dtype=np.float32), np.linspace(0, 1, height, dtype=np.float32))
+    image = np.dstack([x * 200, y * 200, (1 - x) * 120 + y * 80])
+    for _ in range(60):
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        cv2.circle(image, center, int(rng.integers(width // 100, width // 10)), rng.integers(0, 255, 3).tolist(), -1)
+    image += rng.normal(0, 6, image.shape).astype(np.float32)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def measure(func, repeat: int) -> tuple:
+    """Best time in seconds, traced peak memory in bytes and output of func."""
+    timings = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        image = func()
+        timings.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return min(timings), peak, image
+
+    
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Compare full resolution and reduced resolution decoding of large JPEGs.')
+    ap.add_argument('-s', '--sizes', nargs='+', type=int, default=[4000, 6000], help='Image widths (4:3). 4000 is 12 MP, 6000 is 27 MP.')
+    ap.add_argument('-q', '--quality', type=int, default=90, help='JPEG quality.')
+    ap.add_argument('-r', '--repeat', type=int, default=5, help='Number of repetitions, the best time is reported.')
+    args = vars(ap.parse_args())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"{'image':>12} {'working resolution':>20} {'decoded':>11} {'time (ms)':>10} {'speedup':>8} {'peak (MB)':>10} {'saving':>7}")
+        for width in args['sizes']:
+            height = width * 3 // 4
+            path = os.path.join(tmp_dir, f'{width}.jpg')
+            cv2.imwrite(path, synthetic_photo(width, height), [cv2.IMWRITE_JPEG_QUALITY, args['quality']])
+            label = f"{width * height / 1e6:.0f} MP"
+
+            full_time, full_peak, full_image = measure(lambda: cv2.imread(path), args['repeat'])
+            print(f"{label:>12} {'full':>20} {f'{full_image.shape[1]}x{full_image.shape[0]}':>11} {full_time * 1000:>10.1f} {'':>8} {full_peak / 1024 ** 2:>10.1f} {'':>7}")
+            for name, working_resolution in WORKING_RESOLUTIONS.items():
+                reduced_time, reduced_peak, image = measure(lambda: read_image(path, working_resolution), args['repeat'])
+                assert image.shape[1] >= working_resolution[0] and image.shape[0] >= working_resolution[1]
+                print(f"{label:>12} {name:>20} {f'{image.shape[1]}x{image.shape[0]}':>11} {reduced_time * 1000:>10.1f} {full_time / reduced_time:>7.1f}x "
+                      f"{reduced_peak / 1024 ** 2:>10.1f} {full_peak / reduced_peak:>6.0f}x")
\ No newline at end of file
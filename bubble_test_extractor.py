@@ -6,17 +6,22 @@
 
 import argparse
 from models import BubbleExtractorImageTransformation
-from controller import AppController
+from controller import AppController, DatasetController, SQLiteResultSink
     
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('-i', '--image_source', default=None, help='Path to image')
+    ap.add_argument('-d', '--dataset_dir', default=None, help='Directory of images to be processed without display')
+    ap.add_argument('-o', '--output', type=str, default='results.sqlite', help='SQLite database receiving the results of the images in dataset_dir')
     ap.add_argument('-c', dest='smart_crop', action='store_false', help='Deactivate smart crop function.')
     ap.add_argument('-b', dest='binarization', action='store_false', help='Deactivate binarization function.')
     args = vars(ap.parse_args())
 
     transformer = BubbleExtractorImageTransformation()
-    if args['image_source']:
+    if args['dataset_dir']:
+        with SQLiteResultSink(args['output']) as sink:
+            DatasetController(source=args['dataset_dir'], image_transformation=transformer, result_callback=sink.result_callback('answers'))
+    elif args['image_source']:
         AppController(source=args['image_source'], image_transformation=transformer, video=False)
     else:
         AppController(source=0, image_transformation=transformer)
\ No newline at end of file
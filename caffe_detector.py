@@ -5,19 +5,68 @@
 # @Last Modified time: 2022-06-20 17:52:36
 
 import argparse
+import cv2
 from models import CaffeDetectorImageTransformation
-from controller import AppController
+from controller import AppController, ResolutionGovernor, MotionGate, MetricsExporter
+
+
+def dnn_names(prefix: str) -> list:
+    """Lowercase names of the cv2.dnn constants starting with prefix (e.g. DNN_BACKEND_)."""
+    return sorted(name[len(prefix):].lower() for name in dir(cv2.dnn) if name.startswith(prefix))
+
     
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('-p', '--prototxt', type=str, default='./resource/deploy.prototxt', help='Path to prototxt file')
     ap.add_argument('-m', '--model', type=str, default='./resource/opencv_face_detector.caffemodel', help='Path to model weights')
     ap.add_argument('-c', '--confidence', type=float, default=0.5, help='Confidence for Face detection')
+    ap.add_argument('-t', '--tile_size', type=int, default=None, help='Split frames larger than this size into overlapping tiles to find small faces in high resolution inputs.')
+    ap.add_argument('-b', '--backend', type=str.lower, default=None, choices=dnn_names('DNN_BACKEND_'), help='cv2.dnn backend name. e.g: opencv, cuda, inference_engine')
+    ap.add_argument('-g', '--target', type=str.lower, default=None, choices=dnn_names('DNN_TARGET_'), help='cv2.dnn target name. e.g: cpu, opencl, cuda')
+    ap.add_argument('-n', '--num_threads', type=int, default=None, help='Number of OpenCV threads.')
+    ap.add_argument('--fp16', action='store_true', help='Run the target in half precision when supported by OpenCV.')
+    ap.add_argument('--profile', action='store_true', help='Print the forward time of each layer of the last processed frame.')
     ap.add_argument('-i', '--image_source', default=None, help='Path to image')
+    ap.add_argument('-v', '--video_sources', nargs='+', default=['0'], help='Webcam indexes or video paths, separated by blank space. Multiple sources share the same model. e.g: 0 1 video.mp4')
+    ap.add_argument('--target_fps', type=float, default=None, help='Adapt the processing resolution of videos to hold this frame rate.')
+    ap.add_argument('--target_latency', type=float, default=None, help='Adapt the processing resolution of videos to hold this p95 latency (ms).')
+    ap.add_argument('--motion_threshold', type=float, default=None, help='Skip video frames whose mean difference (0-255) to the last processed frame is below this threshold.')
+    ap.add_argument('--max_staleness', type=int, default=30, help='Maximum number of consecutive frames skipped by the motion threshold.')
+    ap.add_argument('--metrics_file', type=str, default=None, help='Write live video metrics to this Prometheus text file.')
+    ap.add_argument('--metrics_port', type=int, default=None, help='Serve live video metrics on http://127.0.0.1:<port>/metrics.')
+    ap.add_argument('--refresh_rate', type=float, default=30, help='Maximum display refresh rate of videos. Frames that cannot be shown are dropped.')
+    ap.add_argument('--headless', action='store_true', help='Process videos without displaying them.')
+    ap.add_argument('-w', '--workers', type=int, default=None, help='Process video frames in parallel with this number of worker processes.')
     args = vars(ap.parse_args())
+    if args['workers'] is not None and not args['image_source']:
+        if args['profile']:
+            ap.error('--profile is not supported with -w/--workers, the network of the main process never runs')
+        if len(args['video_sources']) > 1:
+            ap.error('-w/--workers is not supported with multiple video sources')
+        if args['target_fps'] or args['target_latency'] or args['motion_threshold'] is not None:
+            ap.error('-w/--workers is not supported with --target_fps, --target_latency or --motion_threshold')
+    video_sources = [int(source) if source.isdigit() else source for source in args['video_sources']]
+    video_source = video_sources if len(video_sources) > 1 else video_sources[0]
     
-    net = CaffeDetectorImageTransformation(args['prototxt'], args['model'])
+    backend = getattr(cv2.dnn, f"DNN_BACKEND_{args['backend'].upper()}") if args['backend'] else None
+    target = getattr(cv2.dnn, f"DNN_TARGET_{args['target'].upper()}") if args['target'] else None
+    
+    net = CaffeDetectorImageTransformation(args['prototxt'], args['model'], tile_size=args['tile_size'], 
+                                           backend=backend, target=target, num_threads=args['num_threads'], fp16=args['fp16'])
+    controller_kw = dict(refresh_rate=args['refresh_rate'], headless=args['headless'])
+    if args['target_fps'] or args['target_latency']:
+        controller_kw['resolution_governor'] = ResolutionGovernor(target_fps=args['target_fps'], target_latency=args['target_latency'])
+    if args['motion_threshold'] is not None:
+        controller_kw['motion_gate'] = MotionGate(threshold=args['motion_threshold'], max_staleness=args['max_staleness'])
+    metrics = None
+    if args['metrics_file'] or args['metrics_port']:
+        metrics = controller_kw['metrics'] = MetricsExporter(path=args['metrics_file'], port=args['metrics_port'])
     if args['image_source']:
         AppController(source=args['image_source'], image_transformation=net, video=False, transformation_kw=dict(confidence=args['confidence']))
     else:
-        AppController(source=0, image_transformation=net, transformation_kw=dict(confidence=args['confidence']))
\ No newline at end of file
+        AppController(source=video_source, image_transformation=net, transformation_kw=dict(confidence=args['confidence']), controller_kw=controller_kw, n_workers=args['workers'])
+    if metrics is not None:
+        metrics.close()
+    
+    if args['profile']:
+        print(net.layer_timings_report())
\ No newline at end of file
@@ -1 +1,11 @@
-from .appController import AppController
\ No newline at end of file
+from .appController import AppController
+from .multiVideoController import MultiVideoController
+from .resolutionGovernor import ResolutionGovernor
+from .motionGate import MotionGate
+from .processPoolVideoController import ProcessPoolVideoController
+from .imageController import DatasetController
+from .landmarkWriter import LandmarkWriter
+from .pipelineGraphController import PipelineGraphController
+from .metricsExporter import MetricsExporter
+from .displayLoop import DisplayLoop
+from .sqliteResultSink import SQLiteResultSink
\ No newline at end of file
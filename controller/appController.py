@@ -1,18 +1,38 @@
-from typing import Union
+from typing import List, Union
 from models.interface import ImageTransformationInterface
 from .imageController import VideoController, ImageController
+from .multiVideoController import MultiVideoController
+from .processPoolVideoController import ProcessPoolVideoController
 
 class AppController:
-    """Aplication Controller that chooses between the VideoController and ImageController.
+    """Aplication Controller that chooses between the VideoController, MultiVideoController, ProcessPoolVideoController and ImageController.
 
     Args:
-        source (int): Path to image or Video Source.
+        source (Union[str, int, list]): Path to image, Video Source or list of Video Sources.
         image_transformation (ImageTransformationInterface, optional): Image Transformation pipeline to be applied.
         video (bool, optional): Boolean to load video from source. Defaults to True.
         transformation_kw (dict, optional): Extra variable arguments to the image_transformation pipeline. Defaults to {}.
+        controller_kw (dict, optional): Extra variable arguments to the video controllers. Defaults to {}.
+        n_workers (int, optional): Process video frames in a pool of worker processes. Only supported with a single video source,
+            without resolution_governor nor motion_gate. Defaults to None.
+
+    Raises:
+        ValueError: If n_workers is combined with multiple video sources, a resolution governor or a motion gate.
     """        
-    def __init__(self, source: Union[str, int], image_transformation: ImageTransformationInterface, video: bool=True, transformation_kw: dict={}):
+    PROCESS_POOL_UNSUPPORTED_KW = ('resolution_governor', 'motion_gate')
+
+    def __init__(self, source: Union[str, int, List[Union[str, int]]], image_transformation: ImageTransformationInterface, video: bool=True, transformation_kw: dict={}, controller_kw: dict={}, n_workers: int=None):
+        if video and n_workers is not None:
+            if isinstance(source, (list, tuple)):
+                raise ValueError("n_workers is not supported with multiple video sources")
+            unsupported_kw = [name for name in self.PROCESS_POOL_UNSUPPORTED_KW if controller_kw.get(name) is not None]
+            if unsupported_kw:
+                raise ValueError(f"n_workers is not supported with {', '.join(unsupported_kw)}")
         if not video:
             ImageController(source, image_transformation, transformation_kw=transformation_kw)
+        elif isinstance(source, (list, tuple)):
+            MultiVideoController(source, image_transformation, transformation_kw=transformation_kw, **controller_kw)
+        elif n_workers is not None:
+            ProcessPoolVideoController(source, image_transformation, transformation_kw=transformation_kw, n_workers=n_workers, **controller_kw)
         else:
-            VideoController(0, image_transformation, transformation_kw=transformation_kw)
\ No newline at end of file
+            VideoController(source, image_transformation, transformation_kw=transformation_kw, **controller_kw)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import time
+import threading
+from typing import Dict
+from collections.abc import Callable
+import cv2
+import numpy.typing as npt
+from .metricsExporter import MetricsExporter
+
+
+class DisplayLoop:
+    """Display consumer that renders the latest frame of each window at a fixed refresh rate, so showing frames never throttles processing.
+    HighGUI is not thread-safe (Cocoa aborts and Qt warns outside the main thread), so windows are only touched by `run`, on the calling thread,
+    while capture and processing run on a worker thread. The worker hands frames over with `show`, which only keeps a reference.
+    Frames replaced before being rendered are dropped. In headless mode the worker runs on the calling thread and no window is opened.
+
+    Args:
+        refresh_rate (float, optional): Maximum number of window refreshes per second. Defaults to 30.
+        headless (bool, optional): Do not display frames. Defaults to False.
+        metrics (MetricsExporter, optional): Exports the frames dropped by the display as frames_dropped_total, labelled by display window. Defaults to None.
+    """        
+    def __init__(self, refresh_rate: float=30, headless: bool=False, metrics: MetricsExporter=None):
+        self.refresh_rate = refresh_rate
+        self.headless = headless
+        self.metrics = metrics
+        self.shown = 0
+        self.dropped = 0
+        self.__lock = threading.Lock()
+        self.__pending: Dict[str, npt.ArrayLike] = {}
+        self.__stop_event = threading.Event()
+
+    def show(self, image: npt.ArrayLike, window_name: str='Frame'):
+        """Hand a frame over to be displayed. The image must not be modified afterwards.
+
+        Args:
+            image (npt.ArrayLike): Frame to be displayed.
+            window_name (str, optional): Window name. Defaults to 'Frame'.
+        """        
+        if self.headless:
+            return
+        with self.__lock:
+            dropped = window_name in self.__pending
+            if dropped:
+                self.dropped += 1
+            self.__pending[window_name] = image
+        if dropped and self.metrics is not None:
+            self.metrics.inc('frames_dropped_total', labels={'display': window_name})
+
+    @property
+    def stopped(self) -> bool:
+        """True once ESC was pressed in any window or the display was interrupted. Workers must return when it is set."""
+        return self.__stop_event.is_set()
+
+    def _render(self):
+        """Show the frames handed over since the last refresh and check for ESC."""
+        with self.__lock:
+            pending, self.__pending = self.__pending, {}
+        for window_name, image in pending.items():
+            cv2.imshow(window_name, image)
+        self.shown += len(pending)
+        if (cv2.waitKey(1) & 0xff) == 27:
+            self.__stop_event.set()
+
+    def run(self, worker: Callable):
+        """Run worker() on a worker thread while displaying its frames on the calling thread, until the worker returns.
+        Exceptions raised by the worker are raised here.
+
+        Args:
+            worker (Callable): Capture and processing loop, returning once `stopped` is set or the source is exhausted.
+        """        
+        if self.headless:
+            worker()
+            return
+
+        errors = []
+        def target():
+            try:
+                worker()
+            except BaseException as e:
+                errors.append(e)
+        worker_thread = threading.Thread(target=target, daemon=True)
+        worker_thread.start()
+
+        period = 1.0 / self.refresh_rate
+        next_refresh = time.perf_counter()
+        try:
+            while worker_thread.is_alive():
+                self._render()
+                next_refresh = max(next_refresh + period, time.perf_counter())
+                worker_thread.join(max(next_refresh - time.perf_counter(), 0))
+        finally:
+            self.__stop_event.set()
+            worker_thread.join()
+            cv2.destroyAllWindows()
+        if errors:
+            raise errors[0]
+
+    @property
+    def stats(self) -> dict:
+        """Frames rendered and frames dropped by the display."""
+        return {'shown': self.shown, 'dropped': self.dropped}
@@ -0,0 +1,26 @@
+import time
+from collections import deque
+
+
+class FPSCounter:
+    """Sliding window frames per second estimator.
+
+    Args:
+        window (int, optional): Number of latest ticks used to estimate the rate. Defaults to 30.
+    """        
+    def __init__(self, window: int=30):
+        self.__ticks = deque(maxlen=window)
+        self.count = 0
+
+    def tick(self):
+        """Register a new frame."""        
+        self.__ticks.append(time.perf_counter())
+        self.count += 1
+
+    @property
+    def fps(self) -> float:
+        """Frame rate over the current window. Zero while less than two frames were registered."""        
+        if len(self.__ticks) < 2:
+            return 0.0
+        elapsed = self.__ticks[-1] - self.__ticks[0]
+        return (len(self.__ticks) - 1) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,144 @@
+import os
+import time
+from typing import Tuple, Union
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+FRAMES_FILE = 'frames.raw'
+INDEX_FILE = 'index.npy'
+INDEX_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('height', '<u4'),
+    ('width', '<u4'),
+    ('channels', '<u4'),
+    ('timestamp', '<f8')
+])
+
+
+def is_frame_store(path: Union[int, str]) -> bool:
+    """Check if a path is a directory containing a frame store.
+
+    Args:
+        path (Union[int, str]): Video source.
+
+    Returns:
+        bool: True if it is a frame store directory.
+    """        
+    return isinstance(path, str) and os.path.isfile(os.path.join(path, INDEX_FILE)) and os.path.isfile(os.path.join(path, FRAMES_FILE))
+
+
+def open_video_source(source: Union[int, str]):
+    """Open a video source as a cv2.VideoCapture or, for frame store directories, as a MemmapFrameSource.
+
+    Args:
+        source (Union[int, str]): Webcam index, video path or frame store directory. Objects already implementing `read` are returned as they are.
+
+    Returns:
+        Union[cv2.VideoCapture, MemmapFrameSource]: Opened video source.
+    """        
+    if hasattr(source, 'read'):
+        return source
+    if is_frame_store(source):
+        return MemmapFrameSource(source)
+    return cv2.VideoCapture(source)
+
+
+class FrameStoreWriter:
+    """Writes decoded frames into a raw frame store so later runs can skip decoding.
+    The store is a directory holding every frame bytes back to back in `frames.raw` and their offset, shape and timestamp in `index.npy`.
+
+    Args:
+        path (str): Frame store directory.
+    """        
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.__frames_file = open(os.path.join(path, FRAMES_FILE), 'wb')
+        self.__index = []
+        self.__offset = 0
+
+    def write(self, frame: npt.ArrayLike, timestamp: float=None):
+        """Append a decoded frame to the store.
+
+        Args:
+            frame (npt.ArrayLike): Decoded uint8 image.
+            timestamp (float, optional): Capture time in seconds. Defaults to the current time.
+        """        
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        h, w = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        self.__frames_file.write(frame.data)
+        self.__index.append((self.__offset, h, w, channels, time.time() if timestamp is None else timestamp))
+        self.__offset += frame.nbytes
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    def close(self):
+        """Flush frames and write the store index."""
+        self.__frames_file.close()
+        np.save(os.path.join(self.path, INDEX_FILE), np.asarray(self.__index, dtype=INDEX_DTYPE))
+
+    def __enter__(self) -> 'FrameStoreWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class MemmapFrameSource:
+    """Frame source replaying a frame store through a read-only np.memmap, mimicking the cv2.VideoCapture reading interface.
+    `read` returns a private copy of each frame, a single memcpy instead of a decode, so transformations may draw over it
+    while the mapped pages stay clean and can be reclaimed by the OS. Indexing returns read-only views.
+    Every stored frame is returned in order, which makes runs reproducible.
+
+    Args:
+        path (str): Frame store directory.
+    """        
+    def __init__(self, path: str):
+        self.path = path
+        self.index = np.load(os.path.join(path, INDEX_FILE))
+        frames_path = os.path.join(path, FRAMES_FILE)
+        self.__frames = np.memmap(frames_path, dtype=np.uint8, mode='r') if os.path.getsize(frames_path) > 0 else None
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, frame_idx: int) -> npt.ArrayLike:
+        offset, h, w, channels, _ = (int(value) for value in self.index[frame_idx])
+        frame = self.__frames[offset:offset + h * w * channels]
+        shape = (h, w, channels) if channels > 1 else (h, w)
+        return frame.reshape(shape)
+
+    @property
+    def timestamps(self) -> npt.ArrayLike:
+        """Capture timestamp of every stored frame."""
+        return self.index['timestamp']
+
+    def isOpened(self) -> bool:
+        return self.__frames is not None
+
+    def read(self) -> Tuple[bool, npt.ArrayLike]:
+        """Read the next stored frame.
+
+        Returns:
+            tuple[bool, npt.ArrayLike]: False and None after the last frame. Otherwise True and a writable copy of the frame.
+        """        
+        if self.position >= len(self):
+            return False, None
+        frame = np.array(self[self.position])
+        self.position += 1
+        return True, frame
+
+    def seek(self, frame_idx: int):
+        """Move the replay to a given frame.
+
+        Args:
+            frame_idx (int): Index of the next frame to be read.
+        """        
+        self.position = min(max(frame_idx, 0), len(self))
+
+    def release(self):
+        self.__frames = None
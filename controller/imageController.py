@@ -1,8 +1,17 @@
+import os
+import time
 from abc import ABC, abstractmethod
 from typing import Union
+from collections.abc import Callable
 import cv2
 import numpy.typing as npt
 from models.interface import ImageTransformationInterface
+from .frameStore import open_video_source
+from .resolutionGovernor import ResolutionGovernor
+from .motionGate import MotionGate
+from .metricsExporter import MetricsExporter
+from .displayLoop import DisplayLoop
+from .imageLoader import read_image
 
 
 class AbstractImageController(ABC):
@@ -10,39 +19,78 @@ class AbstractImageController(ABC):
     def __init__(self, source: Union[int, str], image_transformation: ImageTransformationInterface=None, transformation_kw: dict={}):
         pass
 
-    def show_image(self, image: npt.ArrayLike, wait_key: bool=False) -> int:
-        cv2.imshow('Frame', image)
+    def show_image(self, image: npt.ArrayLike, wait_key: bool=False, window_name: str='Frame') -> int:
+        cv2.imshow(window_name, image)
         if wait_key:
             cv2.waitKey(0)
             return -1
-        return cv2.waitKey(30) & 0xff
+        return cv2.waitKey(1) & 0xff
     
 
 class VideoController(AbstractImageController):
     """Aplication Controller to load video/webcam and apply an image transformation pipelinte in each frame.
 
     Args:
-        source (int): Video source.
+        source (Union[int, str]): Video source. Webcam index, video path or frame store directory.
         image_transformation (ImageTransformationInterface, optional): Image Transformation pipeline to be applied. Defaults to None.
         transformation_kw (dict, optional): Extra variable arguments to the image_transformation pipeline. Defaults to {}.
+        resolution_governor (ResolutionGovernor, optional): Adapts the processing resolution to a frame rate or latency budget. Defaults to None.
+        motion_gate (MotionGate, optional): Reuses the last output for frames without relevant changes. Defaults to None.
+        metrics (MetricsExporter, optional): Exports captured, processed, skipped and display-dropped frames, transformation latency and capture-to-output latency. Defaults to None.
+        refresh_rate (float, optional): Maximum display refresh rate. Frames are captured and processed on a worker thread and displayed by a DisplayLoop on the calling thread, which drops the frames it cannot show. Defaults to 30.
+        headless (bool, optional): Process frames without displaying them. Defaults to False.
     """        
-    def __init__(self, source: int, image_transformation: ImageTransformationInterface=None, transformation_kw: dict={}):
-        cap = cv2.VideoCapture(source)
-        while True:
-            ret, frame = cap.read()
-
-            if image_transformation is not None:
-                frame_list = image_transformation(frame, **transformation_kw)
-                frame = frame_list[0]
-            
-            k = self.show_image(frame, wait_key=False)
-            if k == 27:
-                break
-        cv2.destroyAllWindows()
-        cap.release()
+    def __init__(self, source: Union[int, str], image_transformation: ImageTransformationInterface=None, transformation_kw: dict={}, 
+                 resolution_governor: ResolutionGovernor=None, motion_gate: MotionGate=None, metrics: MetricsExporter=None,
+                 refresh_rate: float=30, headless: bool=False):
+        cap = open_video_source(source)
+        display = DisplayLoop(refresh_rate, headless, metrics)
+        metric_labels = {'transformation': type(image_transformation).__name__, 'stream': '0'}
+
+        def process_frames():
+            while not display.stopped:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                capture_time = time.perf_counter()
+                if metrics is not None:
+                    metrics.inc('frames_captured_total')
+
+                if image_transformation is not None:
+                    if motion_gate is not None and not motion_gate.should_process(frame):
+                        frame_list = motion_gate.reuse()
+                        if metrics is not None:
+                            metrics.inc('frames_skipped_total')
+                    else:
+                        if resolution_governor is not None:
+                            frame_list = resolution_governor(image_transformation, frame, **transformation_kw)
+                        else:
+                            frame_list = image_transformation(frame, **transformation_kw)
+                        if motion_gate is not None:
+                            motion_gate.register(frame_list)
+                        if metrics is not None:
+                            metrics.inc('frames_processed_total')
+                            metrics.observe('transformation_latency_ms', (time.perf_counter() - capture_time) * 1000, metric_labels)
+                            if resolution_governor is not None:
+                                metrics.set('working_width', resolution_governor.size)
+                    frame = frame_list[0]
+
+                display.show(frame)
+                if metrics is not None:
+                    metrics.observe('capture_to_output_latency_ms', (time.perf_counter() - capture_time) * 1000)
+
+        try:
+            display.run(process_frames)
+        finally:
+            cap.release()
+        if not headless:
+            print(f"Display: {display.stats}")
+        if motion_gate is not None:
+            print(f"Motion gate: {motion_gate.stats}")
 
 class ImageController(AbstractImageController):
     """Aplication Controller to load an image and apply an image transformation pipelinte.
+    Images are decoded at a reduced resolution when the transformation declares a smaller working_resolution.
 
     Args:
         source (int): Path to the image.
@@ -50,7 +98,7 @@ class ImageController(AbstractImageController):
         transformation_kw (dict, optional): Extra variable arguments to the image_transformation pipeline. Defaults to {}.
     """        
     def __init__(self, source: str, image_transformation: ImageTransformationInterface=None, transformation_kw: dict={}):
-        image = cv2.imread(source)
+        image = read_image(source, getattr(image_transformation, 'working_resolution', None))
 
         if image_transformation is not None:
                 image_list = image_transformation(image, **transformation_kw)
@@ -62,4 +110,39 @@ class ImageController(AbstractImageController):
     def show_image_list(self, image_list: list[npt.ArrayLike], wait_key: bool):
         for image in image_list:
             k = self.show_image(image, wait_key)
-            cv2.destroyAllWindows()
\ No newline at end of file
+            cv2.destroyAllWindows()
+
+
+class DatasetController(AbstractImageController):
+    """Aplication Controller to apply an image transformation pipeline over every image of a directory, without displaying them.
+    Results are handed to a callback after each image, so they can be streamed to disk instead of kept in memory.
+    Images are decoded at a reduced resolution when the transformation declares a smaller working_resolution.
+
+    Args:
+        source (str): Directory containing the images.
+        image_transformation (ImageTransformationInterface): Image Transformation pipeline to be applied.
+        transformation_kw (dict, optional): Extra variable arguments to the image_transformation pipeline. Defaults to {}.
+        result_callback (Callable, optional): Called as result_callback(image_id, image_transformation, elapsed) after each image,
+            with the image file name and the transformation time in seconds. Defaults to None.
+    """        
+    IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+    def __init__(self, source: str, image_transformation: ImageTransformationInterface, transformation_kw: dict={},
+                 result_callback: Callable=None):
+        image_ids = sorted(name for name in os.listdir(source) if name.lower().endswith(self.IMAGE_EXTENSIONS))
+        total_elapsed = 0.0
+        processed = 0
+        for image_id in image_ids:
+            image = read_image(os.path.join(source, image_id), image_transformation.working_resolution)
+            if image is None:
+                print(f"Skipping unreadable image {image_id}")
+                continue
+
+            start = time.perf_counter()
+            image_transformation(image, **transformation_kw)
+            elapsed = time.perf_counter() - start
+            total_elapsed += elapsed
+            processed += 1
+            if result_callback is not None:
+                result_callback(image_id, image_transformation, elapsed)
+        print(f"{processed} images processed in {total_elapsed:.2f}s")
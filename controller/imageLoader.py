@@ -0,0 +1,89 @@
+import os
+import struct
+from typing import Tuple
+import cv2
+import numpy.typing as npt
+
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+REDUCED_COLOR_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8
+}
+
+
+def jpeg_size(path: str) -> Tuple[int, int]:
+    """Read the width and height of a JPEG image from its header, without decoding it.
+
+    Args:
+        path (str): Path to the image.
+
+    Returns:
+        tuple[int, int]: Width and height. None for other formats, malformed headers or unreadable files.
+    """        
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        if f.read(2) != b'\xff\xd8':
+            return None
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            if marker[1] in (0x01, 0xFF) or 0xD0 <= marker[1] <= 0xD7:
+                continue
+            segment_size = f.read(2)
+            if len(segment_size) < 2:
+                return None
+            if marker[1] in JPEG_SOF_MARKERS:
+                segment = f.read(5)
+                if len(segment) < 5:
+                    return None
+                h, w = struct.unpack('>HH', segment[1:5])
+                return w, h
+            f.seek(struct.unpack('>H', segment_size)[0] - 2, 1)
+
+
+def reduction_factor(source_size: Tuple[int, int], working_resolution: Tuple[int, int]=None) -> int:
+    """Pick the largest decode reduction that keeps the image at least as large as the working resolution in both orientations,
+    since the EXIF orientation may swap the sides of the decoded image.
+
+    Args:
+        source_size (tuple[int, int]): Width and height of the encoded image.
+        working_resolution (tuple[int, int], optional): Width and height the transformation works on, 0 for a side following the aspect ratio.
+            Defaults to None.
+
+    Returns:
+        int: Reduction factor, 1, 2, 4 or 8.
+    """        
+    if not working_resolution:
+        return 1
+    w, h = source_size
+    target_w, target_h = working_resolution
+    for factor in (8, 4, 2):
+        if min(-(-w // factor), -(-h // factor)) >= max(target_w, target_h):
+            return factor
+    return 1
+
+
+def read_image(path: str, working_resolution: Tuple[int, int]=None) -> npt.ArrayLike:
+    """Read a color image, decoding JPEGs at the lowest resolution still covering the working resolution.
+    JPEG decoders scale the DCT while decoding, so large JPEGs are never decoded in full. Other formats would be decoded in full
+    and then downsized by OpenCV, so they are read at full resolution with a single decode.
+
+    Args:
+        path (str): Path to the image.
+        working_resolution (tuple[int, int], optional): Width and height the transformation works on, 0 for a side following the aspect ratio.
+            The full resolution is read if None. Defaults to None.
+
+    Returns:
+        npt.ArrayLike: BGR image. None if the image can not be read.
+    """        
+    if not working_resolution:
+        return cv2.imread(path)
+    size = jpeg_size(path)
+    if size is None:
+        return cv2.imread(path)
+    factor = reduction_factor(size, working_resolution)
+    return cv2.imread(path, REDUCED_COLOR_FLAGS[factor])
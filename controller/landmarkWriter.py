@@ -0,0 +1,95 @@
+import os
+import struct
+from typing import List
+import numpy as np
+import numpy.typing as npt
+
+HEADER_SIZE = 256
+
+
+class LandmarkWriter:
+    """Streams face landmarks of a dataset to disk, so memory does not grow with the number of processed images.
+    Every face is appended as a (image_idx, landmarks) int32 record to a .npy file whose fixed size header is rewritten with the final count on close.
+    With a .npz output the records are split into `landmarks` (faces, num_parts, 2), `image_idx` (faces,) and `image_ids` arrays on close.
+    With a .npy output the records are kept as a structured array and the image ids are written to a sidecar `.ids.txt` file.
+
+    Args:
+        path (str): Output file path, ending with .npy or .npz.
+        num_parts (int, optional): Number of landmarks per face. Defaults to 68.
+        compress (bool, optional): Compress the .npz archive. Defaults to False.
+    """        
+    def __init__(self, path: str, num_parts: int=68, compress: bool=False):
+        if not path.endswith(('.npy', '.npz')):
+            raise ValueError(f"LandmarkWriter output must be a .npy or .npz file, got {path}")
+        self.path = path
+        self.compress = compress
+        self.dtype = np.dtype([('image_idx', '<i4'), ('landmarks', '<i4', (num_parts, 2))])
+        self.image_ids = []
+        self.faces = 0
+        self.__records_path = path if path.endswith('.npy') else f"{path}.records.npy"
+        self.__file = open(self.__records_path, 'wb')
+        self.__write_header()
+
+    def __write_header(self):
+        """Write the .npy header padded to HEADER_SIZE bytes, so it can be rewritten in place once the number of faces changes."""
+        header = repr({'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False, 'shape': (self.faces,)})
+        preamble_size = len(np.lib.format.MAGIC_PREFIX) + 2 + 2
+        header = header.ljust(HEADER_SIZE - preamble_size - 1) + '\n'
+        if len(header) + preamble_size != HEADER_SIZE:
+            raise ValueError(f"Landmark record description does not fit a {HEADER_SIZE} bytes header")
+        self.__file.seek(0)
+        self.__file.write(np.lib.format.MAGIC_PREFIX + bytes([1, 0]) + struct.pack('<H', len(header)) + header.encode('latin1'))
+
+    def write(self, image_id: str, landmarks: npt.ArrayLike):
+        """Append the landmarks of every face found in an image.
+
+        Args:
+            image_id (str): Image identifier, usually its file name.
+            landmarks (npt.ArrayLike): (faces, num_parts, 2) array of (x, y) landmark coordinates.
+        """        
+        records = np.empty(len(landmarks), dtype=self.dtype)
+        records['image_idx'] = len(self.image_ids)
+        records['landmarks'] = landmarks
+        self.__file.seek(0, os.SEEK_END)
+        self.__file.write(records.data)
+        self.image_ids.append(image_id)
+        self.faces += len(records)
+
+    def close(self):
+        """Finish the records file header and, for .npz outputs, pack the arrays into the archive."""
+        self.__write_header()
+        self.__file.close()
+        if self.path.endswith('.npy'):
+            with open(f"{os.path.splitext(self.path)[0]}.ids.txt", 'w') as f:
+                f.writelines(f"{image_id}\n" for image_id in self.image_ids)
+            return
+
+        records = np.load(self.__records_path, mmap_mode='r')
+        save = np.savez_compressed if self.compress else np.savez
+        save(self.path, landmarks=records['landmarks'], image_idx=records['image_idx'], image_ids=np.asarray(self.image_ids, dtype=str))
+        del records
+        os.remove(self.__records_path)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """Load landmarks written by a LandmarkWriter.
+
+        Args:
+            path (str): .npy or .npz file path.
+
+        Returns:
+            dict: landmarks, image_idx and image_ids arrays.
+        """        
+        if path.endswith('.npz'):
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+        records = np.load(path, mmap_mode='r')
+        with open(f"{os.path.splitext(path)[0]}.ids.txt") as f:
+            image_ids: List[str] = f.read().splitlines()
+        return {'landmarks': records['landmarks'], 'image_idx': records['image_idx'], 'image_ids': np.asarray(image_ids, dtype=str)}
+
+    def __enter__(self) -> 'LandmarkWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,191 @@
+import os
+import time
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+import numpy as np
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class MetricsExporter:
+    """Publishes live counters, gauges and latency summaries of a running pipeline in the Prometheus text format.
+    Recording a value only touches a dict or a bounded deque under a lock, while a background thread renders the metrics
+    every interval, derives a `<counter>_per_second` gauge from each counter and writes them to a file and/or serves them over HTTP.
+    Latency quantiles are computed over a reservoir with the most recent observations.
+
+    Args:
+        path (str, optional): Prometheus text file, rewritten atomically on every refresh (e.g. for the node exporter textfile collector). Defaults to None.
+        port (int, optional): Serve the metrics on http://host:port/metrics. Defaults to None.
+        host (str, optional): HTTP server address. Defaults to '127.0.0.1'.
+        interval (float, optional): Refresh period in seconds. Defaults to 1.0.
+        reservoir_size (int, optional): Number of recent observations kept by each summary. Defaults to 1024.
+        prefix (str, optional): Prefix of every metric name. Defaults to 'opencv_pipeline'.
+    """        
+    def __init__(self, path: str=None, port: int=None, host: str='127.0.0.1', interval: float=1.0, reservoir_size: int=1024,
+                 prefix: str='opencv_pipeline'):
+        self.path = path
+        self.interval = interval
+        self.reservoir_size = reservoir_size
+        self.prefix = prefix
+        self.__lock = threading.Lock()
+        self.__counters = {}
+        self.__gauges = {}
+        self.__summaries = {}
+        self.__last_counters = {}
+        self.__last_refresh = time.perf_counter()
+        self.__rates = {}
+        self.__text = ''
+        self.__stop_event = threading.Event()
+
+        self.__server = None
+        if port is not None:
+            self.__server = ThreadingHTTPServer((host, port), self._handler())
+            threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> Tuple[str, tuple]:
+        return name, tuple(sorted(labels.items())) if labels else ()
+
+    def inc(self, name: str, value: float=1, labels: dict=None):
+        """Increase a counter.
+
+        Args:
+            name (str): Counter name, usually ending with `_total`.
+            value (float, optional): Increment. Defaults to 1.
+            labels (dict, optional): Metric labels. Defaults to None.
+        """        
+        key = self._key(name, labels)
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: dict=None):
+        """Set a gauge.
+
+        Args:
+            name (str): Gauge name.
+            value (float): Current value.
+            labels (dict, optional): Metric labels. Defaults to None.
+        """        
+        key = self._key(name, labels)
+        with self.__lock:
+            self.__gauges[key] = value
+
+    def observe(self, name: str, value: float, labels: dict=None):
+        """Record an observation of a summary (e.g. a latency in milliseconds).
+
+        Args:
+            name (str): Summary name.
+            value (float): Observed value.
+            labels (dict, optional): Metric labels. Defaults to None.
+        """        
+        key = self._key(name, labels)
+        with self.__lock:
+            summary = self.__summaries.get(key)
+            if summary is None:
+                summary = self.__summaries[key] = [deque(maxlen=self.reservoir_size), 0, 0.0]
+            summary[0].append(value)
+            summary[1] += 1
+            summary[2] += value
+
+    def _format_name(self, name: str, labels: tuple, extra_labels: dict=None) -> str:
+        labels = dict(labels, **(extra_labels or {}))
+        label_text = ','.join(f'{label}="{str(value)}"' for label, value in labels.items())
+        return f"{self.prefix}_{name}{{{label_text}}}" if label_text else f"{self.prefix}_{name}"
+
+    def render(self) -> str:
+        """Render the current metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text.
+        """        
+        with self.__lock:
+            counters = dict(self.__counters)
+            gauges = dict(self.__gauges)
+            summaries = {key: (np.asarray(reservoir), count, total) for key, (reservoir, count, total) in self.__summaries.items()}
+
+        now = time.perf_counter()
+        elapsed = now - self.__last_refresh
+        if elapsed > 0:
+            self.__rates = {key: (value - self.__last_counters.get(key, 0)) / elapsed for key, value in counters.items()}
+            self.__last_counters = counters
+            self.__last_refresh = now
+
+        lines = []
+        typed = set()
+        def add(name: str, metric_type: str, labels: tuple, value: float, extra_labels: dict=None):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {self.prefix}_{name} {metric_type}")
+            lines.append(f"{self._format_name(name, labels, extra_labels)} {value:.6g}")
+
+        for (name, labels), value in sorted(counters.items()):
+            add(name, 'counter', labels, value)
+        for (name, labels), value in sorted(self.__rates.items()):
+            add(f"{name[:-len('_total')] if name.endswith('_total') else name}_per_second", 'gauge', labels, value)
+        for (name, labels), value in sorted(gauges.items()):
+            add(name, 'gauge', labels, value)
+        for (name, labels), (reservoir, count, total) in sorted(summaries.items(), key=lambda item: item[0]):
+            quantiles = np.quantile(reservoir, QUANTILES) if len(reservoir) else [float('nan')] * len(QUANTILES)
+            for q, value in zip(QUANTILES, quantiles):
+                add(name, 'summary', labels, value, {'quantile': q})
+            lines.append(f"{self._format_name(f'{name}_sum', labels)} {total:.6g}")
+            lines.append(f"{self._format_name(f'{name}_count', labels)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def refresh(self):
+        """Render the metrics and publish them to the file and the HTTP endpoint."""
+        self.__text = self.render()
+        if self.path is not None:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(self.__text)
+            os.replace(tmp_path, self.path)
+
+    def __run(self):
+        while not self.__stop_event.wait(self.interval):
+            self.refresh()
+
+    def _handler(self) -> type:
+        """HTTP request handler class serving the last rendered metrics."""
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.text.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return MetricsHandler
+
+    @property
+    def text(self) -> str:
+        """Last published metrics text."""
+        return self.__text
+
+    def close(self):
+        """Stop the background thread and the HTTP server, publishing the final metrics."""
+        self.__stop_event.set()
+        self.__thread.join()
+        self.refresh()
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+
+    def __enter__(self) -> 'MetricsExporter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,91 @@
+from typing import List
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+
+class MotionGate:
+    """Skips the processing of frames without relevant changes, reusing the last processed output instead.
+    Frames are compared against the last processed one through the mean absolute difference of small grayscale thumbnails.
+
+    Args:
+        threshold (float, optional): Mean absolute difference (0-255) from which a frame is processed. Defaults to 2.0.
+        size (int, optional): Width of the thumbnails compared. Defaults to 64.
+        max_staleness (int, optional): Maximum number of consecutive skipped frames. Defaults to 30.
+    """        
+    def __init__(self, threshold: float=2.0, size: int=64, max_staleness: int=30):
+        self.threshold = threshold
+        self.size = size
+        self.max_staleness = max_staleness
+        self.processed = 0
+        self.skipped = 0
+        self.__reference = None
+        self.__candidate = None
+        self.__last_outputs = None
+        self.__staleness = 0
+
+    def fork(self) -> 'MotionGate':
+        """Create a gate with the same settings and its own reference frame, to gate an independent stream.
+
+        Returns:
+            MotionGate: Gate for a new stream.
+        """        
+        return MotionGate(self.threshold, self.size, self.max_staleness)
+
+    def _thumbnail(self, image: npt.ArrayLike) -> npt.ArrayLike:
+        """Downsample the frame into a small grayscale thumbnail.
+
+        Args:
+            image (npt.ArrayLike): BGR or grayscale frame.
+
+        Returns:
+            npt.ArrayLike: Grayscale thumbnail.
+        """        
+        h, w = image.shape[:2]
+        thumbnail = cv2.resize(image, (self.size, max(int(h * self.size / w), 1)), interpolation=cv2.INTER_AREA)
+        if thumbnail.ndim == 3:
+            thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+        return thumbnail
+
+    def should_process(self, image: npt.ArrayLike) -> bool:
+        """Decide if the frame changed enough to be processed. Skipped frames are counted.
+
+        Args:
+            image (npt.ArrayLike): Source frame.
+
+        Returns:
+            bool: True if the frame must be processed, False if the last output can be reused.
+        """        
+        self.__candidate = self._thumbnail(image)
+        if self.__last_outputs is None or self.__reference.shape != self.__candidate.shape or self.__staleness >= self.max_staleness:
+            return True
+        if cv2.absdiff(self.__candidate, self.__reference).mean() >= self.threshold:
+            return True
+        self.__staleness += 1
+        self.skipped += 1
+        return False
+
+    def register(self, image_list: List[npt.ArrayLike]):
+        """Store the outputs of the processed frame, which becomes the reference for the next ones.
+
+        Args:
+            image_list (list[npt.ArrayLike]): Outputs of the image transformation.
+        """        
+        self.__reference = self.__candidate
+        self.__last_outputs = image_list
+        self.__staleness = 0
+        self.processed += 1
+
+    def reuse(self) -> List[npt.ArrayLike]:
+        """Copy of the outputs of the last processed frame."""
+        return [np.copy(image) for image in self.__last_outputs]
+
+    @property
+    def stats(self) -> dict:
+        """Processed and skipped frame counters."""
+        total = self.processed + self.skipped
+        return {
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'skip_ratio': self.skipped / total if total else 0.0
+        }
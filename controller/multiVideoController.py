@@ -0,0 +1,150 @@
+import time
+import threading
+from typing import List, Tuple, Union
+import cv2
+import numpy.typing as npt
+from models.interface import ImageTransformationInterface
+from .imageController import AbstractImageController
+from .fpsCounter import FPSCounter
+from .frameStore import open_video_source
+from .metricsExporter import MetricsExporter
+from .resolutionGovernor import ResolutionGovernor
+from .motionGate import MotionGate
+from .displayLoop import DisplayLoop
+
+
+class StreamReader(threading.Thread):
+    """Capture thread that keeps only the latest frame read from a video source.
+
+    Args:
+        source (Union[int, str]): Video source. Webcam index, video path or frame store directory.
+    """        
+    def __init__(self, source: Union[int, str]):
+        super().__init__(daemon=True)
+        self.source = source
+        self.capture_fps = FPSCounter()
+        self.finished = False
+        self.__cap = open_video_source(source)
+        self.__lock = threading.Lock()
+        self.__frame = None
+        self.__frame_id = 0
+        self.__stop_event = threading.Event()
+
+    def run(self):
+        while not self.__stop_event.is_set():
+            ret, frame = self.__cap.read()
+            if not ret:
+                break
+            with self.__lock:
+                self.__frame = frame
+                self.__frame_id += 1
+            self.capture_fps.tick()
+        self.finished = True
+        self.__cap.release()
+
+    def latest(self) -> Tuple[int, npt.ArrayLike]:
+        """Latest frame read from the source.
+
+        Returns:
+            tuple[int, npt.ArrayLike]: Frame sequence number (0 while no frame was read) and the frame.
+        """        
+        with self.__lock:
+            return self.__frame_id, self.__frame
+
+    def stop(self):
+        self.__stop_event.set()
+
+
+class MultiVideoController(AbstractImageController):
+    """Aplication Controller to load multiple videos/webcams and apply a shared image transformation pipeline to each of them.
+    Each source is read by its own capture thread, while a single processing thread visits the streams in round-robin
+    order and always processes the latest frame of each stream, dropping the frames it could not keep up with.
+    The image transformation, the resolution governor and the motion gate are forked once per stream, so loaded models are shared and stateful data is not.
+
+    Args:
+        sources (list[Union[int, str]]): Video sources.
+        image_transformation (ImageTransformationInterface, optional): Image Transformation pipeline to be applied. Defaults to None.
+        transformation_kw (dict, optional): Extra variable arguments to the image_transformation pipeline. Defaults to {}.
+        resolution_governor (ResolutionGovernor, optional): Adapts the processing resolution of each stream to a frame rate or latency budget. Defaults to None.
+        motion_gate (MotionGate, optional): Reuses the last output of each stream for frames without relevant changes. Defaults to None.
+        metrics (MetricsExporter, optional): Exports processed, skipped and dropped frames per stream and display and transformation latency per transformation and stream. Defaults to None.
+        refresh_rate (float, optional): Maximum display refresh rate. Defaults to 30.
+        headless (bool, optional): Process frames without displaying them. Defaults to False.
+    """        
+    def __init__(self, sources: List[Union[int, str]], image_transformation: ImageTransformationInterface=None, transformation_kw: dict={},
+                 resolution_governor: ResolutionGovernor=None, motion_gate: MotionGate=None, metrics: MetricsExporter=None, refresh_rate: float=30, headless: bool=False):
+        readers = [StreamReader(source) for source in sources]
+        stream_transformations = [image_transformation.fork() if image_transformation is not None else None for _ in readers]
+        latency_labels = [{'transformation': type(transformation).__name__, 'stream': str(idx)} for idx, transformation in enumerate(stream_transformations)]
+        stream_governors = [resolution_governor.fork() if resolution_governor is not None else None for _ in readers]
+        stream_gates = [motion_gate.fork() if motion_gate is not None else None for _ in readers]
+        last_frame_ids = [0] * len(readers)
+        self.processed_fps = [FPSCounter() for _ in readers]
+
+        for reader in readers:
+            reader.start()
+        display = DisplayLoop(refresh_rate, headless, metrics)
+
+        def process_frames():
+            while not display.stopped:
+                processed_any = False
+                for idx, (reader, transformation, governor, gate) in enumerate(zip(readers, stream_transformations, stream_governors, stream_gates)):
+                    frame_id, frame = reader.latest()
+                    if frame_id == last_frame_ids[idx]:
+                        continue
+                    if metrics is not None:
+                        stream_labels = {'stream': str(idx)}
+                        metrics.inc('frames_dropped_total', frame_id - last_frame_ids[idx] - 1, stream_labels)
+                        start = time.perf_counter()
+                    last_frame_ids[idx] = frame_id
+                    processed_any = True
+
+                    if transformation is not None and gate is not None and not gate.should_process(frame):
+                        frame = gate.reuse()[0]
+                        if metrics is not None:
+                            metrics.inc('frames_skipped_total', labels=stream_labels)
+                            metrics.set('input_fps', reader.capture_fps.fps, stream_labels)
+                        self.__show(display, idx, reader, frame)
+                        continue
+
+                    if transformation is not None:
+                        if governor is not None:
+                            frame_list = governor(transformation, frame, **transformation_kw)
+                        else:
+                            frame_list = transformation(frame, **transformation_kw)
+                        if gate is not None:
+                            gate.register([image.copy() for image in frame_list])
+                        frame = frame_list[0]
+                    self.processed_fps[idx].tick()
+                    if metrics is not None:
+                        metrics.inc('frames_processed_total', labels=stream_labels)
+                        metrics.observe('transformation_latency_ms', (time.perf_counter() - start) * 1000, latency_labels[idx])
+                        metrics.set('input_fps', reader.capture_fps.fps, stream_labels)
+                        if governor is not None:
+                            metrics.set('working_width', governor.size, stream_labels)
+                    self.__show(display, idx, reader, frame)
+
+                if processed_any:
+                    continue
+                if all(reader.finished for reader in readers):
+                    break
+                time.sleep(0.001)
+
+        try:
+            display.run(process_frames)
+        finally:
+            for reader in readers:
+                reader.stop()
+            for reader in readers:
+                reader.join()
+
+        for idx, reader in enumerate(readers):
+            print(f"Stream {idx} ({reader.source}): captured {reader.capture_fps.count} frames, processed {self.processed_fps[idx].count} frames")
+            if stream_gates[idx] is not None:
+                print(f"Stream {idx} motion gate: {stream_gates[idx].stats}")
+
+    def __show(self, display: DisplayLoop, idx: int, reader: StreamReader, frame: npt.ArrayLike):
+        """Overlay the capture and processing rates of a stream and hand its frame over to the display."""
+        text = f"Capture: {reader.capture_fps.fps:.1f} FPS | Processed: {self.processed_fps[idx].fps:.1f} FPS"
+        cv2.putText(frame, text, (10, frame.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+        display.show(frame, f'Frame {idx} ({reader.source})')
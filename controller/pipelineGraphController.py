@@ -0,0 +1,92 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Union
+from collections.abc import Callable
+import numpy as np
+import numpy.typing as npt
+from models.interface import ImageTransformationInterface
+from .imageController import AbstractImageController
+from .frameStore import open_video_source
+from .displayLoop import DisplayLoop
+from .metricsExporter import MetricsExporter
+
+
+def _run_branch(image_transformation: ImageTransformationInterface, frame: npt.ArrayLike, transformation_kw: dict) -> Tuple[List[npt.ArrayLike], float]:
+    """Apply a branch transformation measuring its latency.
+
+    Args:
+        image_transformation (ImageTransformationInterface): Branch Image Transformation pipeline.
+        frame (npt.ArrayLike): Private copy of the frame.
+        transformation_kw (dict): Extra variable arguments to the image_transformation pipeline.
+
+    Returns:
+        tuple[list[npt.ArrayLike], float]: Branch outputs and latency in milliseconds.
+    """        
+    start = time.perf_counter()
+    image_list = image_transformation(frame, **transformation_kw)
+    return image_list, (time.perf_counter() - start) * 1000
+
+
+class PipelineGraphController(AbstractImageController):
+    """Aplication Controller to read a single video/webcam and fan each frame out to several image transformation branches.
+    Branches run concurrently on a thread pool (OpenCV and dlib release the GIL in their heavy calls), each one over its own copy of the frame,
+    and their outputs are joined before the next frame is shown. The next frame is read while the branches process the current one.
+
+    Args:
+        source (Union[int, str]): Video source. Webcam index, video path or frame store directory.
+        branches (dict[str, ImageTransformationInterface]): Image Transformation pipelines by branch name.
+        transformation_kw (dict[str, dict], optional): Extra variable arguments to each branch pipeline, by branch name. Defaults to {}.
+        n_threads (int, optional): Number of threads of the pool. Defaults to the number of branches, limited by the number of cores.
+        result_callback (Callable, optional): Called as result_callback(frame_idx, results) after each frame is joined,
+            with results mapping each branch name to its outputs. Defaults to None.
+        refresh_rate (float, optional): Maximum display refresh rate. Defaults to 30.
+        headless (bool, optional): Process frames without displaying them. Defaults to False.
+        metrics (MetricsExporter, optional): Exports the frames dropped by the display. Defaults to None.
+    """        
+    def __init__(self, source: Union[int, str], branches: Dict[str, ImageTransformationInterface], transformation_kw: Dict[str, dict]={},
+                 n_threads: int=None, result_callback: Callable=None, refresh_rate: float=30, headless: bool=False,
+                 metrics: MetricsExporter=None):
+        n_threads = n_threads or min(len(branches), os.cpu_count())
+        self.latencies = {name: [] for name in branches}
+
+        cap = open_video_source(source)
+        display = DisplayLoop(refresh_rate, headless, metrics)
+
+        def process_frames():
+            ret, frame = cap.read()
+            frame_idx = 0
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                while ret and not display.stopped:
+                    futures = {name: executor.submit(_run_branch, transformation, frame.copy(), transformation_kw.get(name, {}))
+                               for name, transformation in branches.items()}
+                    ret, frame = cap.read()
+
+                    results = {}
+                    for name, future in futures.items():
+                        results[name], latency = future.result()
+                        self.latencies[name].append(latency)
+                    if result_callback is not None:
+                        result_callback(frame_idx, results)
+                    frame_idx += 1
+
+                    for name, image_list in results.items():
+                        display.show(image_list[0], f'Frame ({name})')
+
+        try:
+            display.run(process_frames)
+        finally:
+            cap.release()
+        print(self.latency_report())
+
+    def latency_report(self) -> str:
+        """Describe the latency of each branch.
+
+        Returns:
+            str: Mean and 95th percentile latency of each branch in milliseconds.
+        """        
+        lines = []
+        for name, latencies in self.latencies.items():
+            if latencies:
+                lines.append(f"{name}: {len(latencies)} frames, mean {np.mean(latencies):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms")
+        return '\n'.join(lines)
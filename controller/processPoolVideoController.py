@@ -0,0 +1,175 @@
+import os
+import time
+import queue
+import warnings
+import traceback
+import multiprocessing as mp
+from collections import deque
+from multiprocessing import shared_memory
+from typing import List, Union
+import numpy as np
+from models.interface import ImageTransformationInterface
+from .imageController import AbstractImageController
+from .frameStore import open_video_source
+from .metricsExporter import MetricsExporter
+from .displayLoop import DisplayLoop
+
+RESULT_POLL_INTERVAL = 0.5
+
+
+def _process_frames(image_transformation: ImageTransformationInterface, transformation_kw: dict, slot_names: List[str],
+                    task_queue: mp.Queue, result_queue: mp.Queue):
+    """Worker loop: apply the image transformation to frames placed in shared memory slots.
+    The first output is written back into the frame slot, or sent through the result queue when it does not fit the slot,
+    together with the time spent by the transformation.
+
+    Args:
+        image_transformation (ImageTransformationInterface): Image Transformation pipeline to be applied.
+        transformation_kw (dict): Extra variable arguments to the image_transformation pipeline.
+        slot_names (list[str]): Names of the shared memory slots.
+        task_queue (mp.Queue): Queue of (frame index, slot, shape, dtype) tasks. None stops the worker.
+        result_queue (mp.Queue): Queue of (frame index, slot, shape, dtype, output, error, elapsed) results.
+    """        
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    try:
+        for frame_idx, slot, shape, dtype in iter(task_queue.get, None):
+            frame = np.ndarray(shape, dtype=dtype, buffer=slots[slot].buf)
+            start = time.perf_counter()
+            try:
+                output = np.ascontiguousarray(image_transformation(frame, **transformation_kw)[0])
+            except Exception:
+                del frame
+                result_queue.put((frame_idx, slot, None, None, None, traceback.format_exc(), None))
+                continue
+            elapsed = time.perf_counter() - start
+            if output.nbytes <= slots[slot].size:
+                np.ndarray(output.shape, dtype=output.dtype, buffer=slots[slot].buf)[...] = output
+                result_queue.put((frame_idx, slot, output.shape, output.dtype.str, None, None, elapsed))
+            else:
+                result_queue.put((frame_idx, slot, output.shape, output.dtype.str, output, None, elapsed))
+            del frame, output
+    finally:
+        for shm in slots:
+            shm.close()
+
+
+class ProcessPoolVideoController(AbstractImageController):
+    """Aplication Controller to load video/webcam and apply an image transformation pipeline in each frame using a pool of processes.
+    Frames are handed to the workers through a ring of shared memory slots instead of being pickled, and outputs are shown in frame order.
+    Only transformations declared as stateless run in parallel, stateful ones are pinned to a single worker.
+    Workers are watched while waiting for results, so a worker that dies (e.g. failing to unpickle the transformation, or killed by the OS) raises a RuntimeError.
+
+    Args:
+        source (Union[int, str]): Video source. Webcam index, video path or frame store directory.
+        image_transformation (ImageTransformationInterface): Image Transformation pipeline to be applied. It must be picklable.
+        transformation_kw (dict, optional): Extra variable arguments to the image_transformation pipeline. Defaults to {}.
+        n_workers (int, optional): Number of worker processes. Defaults to the number of cores.
+        n_slots (int, optional): Number of shared memory slots, bounding the frames in flight. Defaults to twice the number of workers.
+        metrics (MetricsExporter, optional): Exports captured, processed and display-dropped frames, transformation latency measured by the workers and capture-to-output latency. Defaults to None.
+        refresh_rate (float, optional): Maximum display refresh rate. Defaults to 30.
+        headless (bool, optional): Process frames without displaying them. Defaults to False.
+    """        
+    def __init__(self, source: Union[int, str], image_transformation: ImageTransformationInterface, transformation_kw: dict={},
+                 n_workers: int=None, n_slots: int=None, metrics: MetricsExporter=None, refresh_rate: float=30, headless: bool=False):
+        n_workers = n_workers or os.cpu_count()
+        if not image_transformation.stateless and n_workers > 1:
+            warnings.warn(f"{type(image_transformation).__name__} is not stateless, it is pinned to a single worker.")
+            n_workers = 1
+        n_slots = n_slots or 2 * n_workers
+
+        cap = open_video_source(source)
+        ret, frame = cap.read()
+        if not ret:
+            cap.release()
+            return
+
+        slot_size = frame.nbytes
+        slots = [shared_memory.SharedMemory(create=True, size=slot_size) for _ in range(n_slots)]
+        ctx = mp.get_context('spawn')
+        task_queue, result_queue = ctx.Queue(), ctx.Queue()
+        workers = [ctx.Process(target=_process_frames, args=(image_transformation, transformation_kw, [shm.name for shm in slots], task_queue, result_queue), daemon=True)
+                   for _ in range(n_workers)]
+        for worker in workers:
+            worker.start()
+
+        free_slots = deque(range(n_slots))
+        pending = {}
+        capture_times = {}
+        sent, shown = 0, 0
+        metric_labels = {'transformation': type(image_transformation).__name__, 'stream': '0'}
+        display = DisplayLoop(refresh_rate, headless, metrics)
+
+        def process_frames():
+            nonlocal frame, sent, shown
+            while not display.stopped:
+                while frame is not None and free_slots:
+                    if frame.nbytes > slot_size:
+                        raise ValueError(f"Frame {sent} is larger than the first frame of the video source")
+                    slot = free_slots.popleft()
+                    np.ndarray(frame.shape, dtype=frame.dtype, buffer=slots[slot].buf)[...] = frame
+                    task_queue.put((sent, slot, frame.shape, frame.dtype.str))
+                    if metrics is not None:
+                        capture_times[sent] = time.perf_counter()
+                        metrics.inc('frames_captured_total')
+                    sent += 1
+                    ret, frame = cap.read()
+                    frame = frame if ret else None
+
+                if shown == sent:
+                    break
+
+                frame_idx, slot, shape, dtype, output, error, elapsed = self._next_result(result_queue, workers)
+                if error is not None:
+                    raise RuntimeError(f"Worker failed processing frame {frame_idx}:\n{error}")
+                if metrics is not None:
+                    metrics.observe('transformation_latency_ms', elapsed * 1000, metric_labels)
+                pending[frame_idx] = (slot, shape, dtype, output)
+
+                while shown in pending:
+                    slot, shape, dtype, output = pending.pop(shown)
+                    if output is None:
+                        output = np.ndarray(shape, dtype=dtype, buffer=slots[slot].buf).copy()
+                    free_slots.append(slot)
+                    shown += 1
+                    display.show(output)
+                    if metrics is not None:
+                        metrics.inc('frames_processed_total')
+                        metrics.observe('capture_to_output_latency_ms', (time.perf_counter() - capture_times.pop(shown - 1)) * 1000)
+
+        try:
+            display.run(process_frames)
+        finally:
+            for _ in workers:
+                task_queue.put(None)
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            for shm in slots:
+                shm.close()
+                shm.unlink()
+            cap.release()
+        print(f"{shown} frames processed by {n_workers} workers")
+
+    @staticmethod
+    def _next_result(result_queue: mp.Queue, workers: List[mp.Process]) -> tuple:
+        """Wait for the next result, checking that every worker is still alive.
+
+        Args:
+            result_queue (mp.Queue): Queue of (frame index, slot, shape, dtype, output, error, elapsed) results.
+            workers (list[mp.Process]): Worker processes.
+
+        Raises:
+            RuntimeError: If a worker exited while frames are still being processed.
+
+        Returns:
+            tuple: Next result.
+        """        
+        while True:
+            try:
+                return result_queue.get(timeout=RESULT_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+            for worker in workers:
+                if not worker.is_alive():
+                    raise RuntimeError(f"Worker {worker.pid} exited with code {worker.exitcode} while processing frames")
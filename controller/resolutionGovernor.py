@@ -0,0 +1,122 @@
+import time
+from typing import List
+import cv2
+import numpy as np
+import numpy.typing as npt
+from models.interface import ImageTransformationInterface
+from models.genericTransformations import GenericTransformations
+
+
+class ResolutionGovernor:
+    """Adapts the processing resolution of a video pipeline to hold a frame rate or a latency budget.
+    Transformations declaring a working_resolution are set to work at the governed width through `set_working_width`, others receive
+    frames resized with GenericTransformations.smart_resize. Outputs are always resized back to the exact source resolution.
+    After every window of frames the working width is lowered when the budget is exceeded and raised when there is spare time.
+
+    Args:
+        target_fps (float, optional): Frame rate to hold, compared against the mean latency. Defaults to None.
+        target_latency (float, optional): 95th percentile latency budget in milliseconds. Used when target_fps is None. Defaults to None.
+        min_size (int, optional): Minimum working width. Defaults to 160.
+        max_size (int, optional): Maximum working width. Limited by the source width if None. Defaults to None.
+        step (float, optional): Relative width change of each adjustment. Defaults to 0.1.
+        window (int, optional): Number of frames measured before each adjustment. Defaults to 15.
+        headroom (float, optional): Fraction of the budget under which the width is raised. Defaults to 0.8.
+    """        
+    def __init__(self, target_fps: float=None, target_latency: float=None, min_size: int=160, max_size: int=None,
+                 step: float=0.1, window: int=15, headroom: float=0.8):
+        if target_fps is None and target_latency is None:
+            raise ValueError("ResolutionGovernor requires a target_fps or a target_latency")
+        self.target_fps = target_fps
+        self.target_latency = target_latency
+        self.min_size = min_size
+        self.max_size = max_size
+        self.step = step
+        self.window = window
+        self.headroom = headroom
+        self.size = None
+        self.__latencies = []
+
+    def fork(self) -> 'ResolutionGovernor':
+        """Create a governor with the same targets and its own measurements, to govern an independent stream.
+
+        Returns:
+            ResolutionGovernor: Governor for a new stream.
+        """        
+        return ResolutionGovernor(self.target_fps, self.target_latency, self.min_size, self.max_size, self.step, self.window, self.headroom)
+
+    @property
+    def budget(self) -> float:
+        """Latency budget in milliseconds."""
+        return 1000.0 / self.target_fps if self.target_fps is not None else self.target_latency
+
+    def _measured_latency(self) -> float:
+        """Latency compared against the budget: mean latency for frame rate targets and 95th percentile otherwise."""
+        if self.target_fps is not None:
+            return float(np.mean(self.__latencies))
+        return float(np.percentile(self.__latencies, 95))
+
+    def _clip_size(self, size: int, source_width: int) -> int:
+        """Limit a working width to [min_size, max_size], max_size being at most the source width."""
+        max_size = min(self.max_size or source_width, source_width)
+        return int(np.clip(size, min(self.min_size, max_size), max_size))
+
+    def _update(self, latency: float, source_width: int):
+        """Register the latency of a frame and adjust the working width at the end of each window.
+
+        Args:
+            latency (float): Frame latency in milliseconds.
+            source_width (int): Width of the source frames.
+        """        
+        self.__latencies.append(latency)
+        if len(self.__latencies) < self.window:
+            return
+        measured_latency = self._measured_latency()
+        self.__latencies.clear()
+
+        if measured_latency > self.budget:
+            self.size = int(self.size * (1 - self.step))
+        elif measured_latency < self.budget * self.headroom:
+            self.size = int(np.ceil(self.size * (1 + self.step)))
+        self.size = self._clip_size(self.size, source_width)
+
+    @staticmethod
+    def _to_source_resolution(image: npt.ArrayLike, source_shape: tuple) -> npt.ArrayLike:
+        """Resize an output image to exactly the source resolution.
+
+        Args:
+            image (npt.ArrayLike): Output image.
+            source_shape (tuple): Shape of the source frame.
+
+        Returns:
+            npt.ArrayLike: Output image in the source resolution.
+        """        
+        if image.shape[:2] == source_shape[:2]:
+            return image
+        return cv2.resize(image, (source_shape[1], source_shape[0]))
+
+    def __call__(self, image_transformation: ImageTransformationInterface, image: npt.ArrayLike, **kwargs) -> List[npt.ArrayLike]:
+        """Apply the image transformation in the current working resolution.
+
+        Args:
+            image_transformation (ImageTransformationInterface): Image Transformation pipeline to be applied.
+            image (npt.ArrayLike): Source frame.
+
+        Returns:
+            list[npt.ArrayLike]: Transformation outputs in the source resolution.
+        """        
+        source_shape = image.shape
+        working_resolution = image_transformation.working_resolution
+        if self.size is None:
+            self.size = self._clip_size(working_resolution[0] if working_resolution else source_shape[1], source_shape[1])
+
+        start = time.perf_counter()
+        processed_image = image
+        if working_resolution:
+            if working_resolution[0] != self.size:
+                image_transformation.set_working_width(self.size)
+        elif self.size != source_shape[1]:
+            processed_image = GenericTransformations.smart_resize(image, self.size, height=False)
+        image_list = image_transformation(processed_image, **kwargs)
+        self._update((time.perf_counter() - start) * 1000, source_shape[1])
+
+        return [self._to_source_resolution(output_image, source_shape) for output_image in image_list]
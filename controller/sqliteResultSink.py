@@ -0,0 +1,138 @@
+import time
+import queue
+import sqlite3
+import threading
+from typing import Any, Iterable, List, Tuple
+from collections.abc import Callable
+from models.interface import ImageTransformationInterface
+
+
+class SQLiteResultSink(threading.Thread):
+    """Streams structured results of image transformations into a SQLite database from a background writer thread.
+    Producers only put rows into an unbounded queue, so disk I/O never blocks processing. The writer commits them
+    in bulk transactions with executemany, every batch_size rows or flush_interval seconds, over a WAL journal.
+    Results are stored in long format, one row per value: (image_id, transformation, key, value, elapsed).
+    Every written image also gets one row in the `<table>_images` table, (image_id, transformation, elapsed, num_values),
+    so images processed without results are told apart from images never processed.
+
+    Args:
+        path (str): SQLite database path.
+        table (str, optional): Results table name. Defaults to 'results'.
+        batch_size (int, optional): Maximum number of rows per transaction. Defaults to 10000.
+        flush_interval (float, optional): Maximum time in seconds rows wait in the queue. Defaults to 1.0.
+    """        
+    def __init__(self, path: str, table: str='results', batch_size: int=10000, flush_interval: float=1.0):
+        super().__init__(daemon=True)
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table}")
+        self.path = path
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.images_written = 0
+        self.rows_written = 0
+        self.__queue = queue.SimpleQueue()
+        self.__error = None
+        self.start()
+
+    @staticmethod
+    def _flatten(value: Any, prefix: str='') -> List[Tuple[str, Any]]:
+        """Flatten nested dicts and sequences into (key, value) pairs with dotted keys.
+
+        Args:
+            value (Any): Structured result.
+            prefix (str, optional): Key of value. Defaults to ''.
+
+        Returns:
+            list[tuple[str, Any]]: Keys and scalar values.
+        """        
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, (list, tuple)):
+            items = enumerate(value)
+        else:
+            if hasattr(value, 'item'):
+                value = value.item()
+            elif not isinstance(value, (int, float, str, bytes, type(None))):
+                value = str(value)
+            return [(prefix, value)]
+        pairs = []
+        for key, item in items:
+            pairs.extend(SQLiteResultSink._flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return pairs
+
+    def write(self, image_id: str, transformation: str, results: Any, elapsed: float=None):
+        """Queue the results of an image, with its row in the images table.
+
+        Args:
+            image_id (str): Image identifier, usually its file name.
+            transformation (str): Transformation name.
+            results (Any): Structured results, nested dicts and sequences are flattened into dotted keys.
+            elapsed (float, optional): Transformation time in seconds. Defaults to None.
+        """        
+        rows = [(image_id, transformation, key, value, elapsed) for key, value in self._flatten(results)]
+        self.__queue.put(((image_id, transformation, elapsed, len(rows)), rows))
+
+    def result_callback(self, result_attribute: str) -> Callable:
+        """Build a DatasetController result_callback writing a transformation attribute.
+
+        Args:
+            result_attribute (str): Transformation attribute holding the results (e.g. 'answers').
+
+        Returns:
+            Callable: result_callback(image_id, image_transformation, elapsed).
+        """        
+        def callback(image_id: str, image_transformation: ImageTransformationInterface, elapsed: float):
+            self.write(image_id, type(image_transformation).__name__, getattr(image_transformation, result_attribute), elapsed)
+        return callback
+
+    def __insert(self, connection: sqlite3.Connection, image_rows: Iterable[tuple], rows: Iterable[tuple]):
+        with connection:
+            connection.executemany(f"INSERT INTO {self.table}_images (image_id, transformation, elapsed, num_values) VALUES (?, ?, ?, ?)", image_rows)
+            connection.executemany(f"INSERT INTO {self.table} (image_id, transformation, key, value, elapsed) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def run(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (image_id TEXT, transformation TEXT, key TEXT, value, elapsed REAL)")
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table}_images (image_id TEXT, transformation TEXT, elapsed REAL, num_values INTEGER)")
+            image_batch, batch = [], []
+            closing = False
+            while not closing:
+                deadline = time.perf_counter() + self.flush_interval
+                while len(image_batch) + len(batch) < self.batch_size:
+                    try:
+                        item = self.__queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        closing = True
+                        break
+                    image_batch.append(item[0])
+                    batch.extend(item[1])
+                if image_batch:
+                    self.__insert(connection, image_batch, batch)
+                    self.images_written += len(image_batch)
+                    self.rows_written += len(batch)
+                    image_batch, batch = [], []
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_image_id ON {self.table} (image_id)")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_images_image_id ON {self.table}_images (image_id)")
+        except Exception as e:
+            self.__error = e
+        finally:
+            connection.close()
+
+    def close(self):
+        """Write the queued rows, index the table by image_id and stop the writer. Errors of the writer are raised here."""
+        self.__queue.put(None)
+        self.join()
+        if self.__error is not None:
+            raise self.__error
+
+    def __enter__(self) -> 'SQLiteResultSink':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -5,18 +5,34 @@
 # @Last Modified time: 2022-06-20 17:52:36
 
 import argparse
-from models import DlibLandmarkDetectorImageTransformation
-from controller import AppController
+from models import DlibLandmarkDetectorImageTransformation, CaffeDetectorImageTransformation, CascadedFaceLandmarkImageTransformation
+from controller import AppController, DatasetController, LandmarkWriter
     
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('-m', '--model', type=str, default='./resource/shape_predictor_68_face_landmarks.dat', help='Path to model weights')
     ap.add_argument('-u', '--num_upsamples', type=int, default=1, help='Confidence for Face detection')
     ap.add_argument('-i', '--image_source', default=None, help='Path to image')
+    ap.add_argument('-d', '--dataset_dir', default=None, help='Directory of images to be processed without display')
+    ap.add_argument('-f', '--face_detector', choices=['hog', 'caffe'], default='hog', help='Face finder of the shape predictor: Dlib HOG detector or Caffe DNN face detector')
+    ap.add_argument('-p', '--prototxt', type=str, default='./resource/deploy.prototxt', help='Path to the Caffe face detector prototxt file')
+    ap.add_argument('--face_model', type=str, default='./resource/opencv_face_detector.caffemodel', help='Path to the Caffe face detector weights')
+    ap.add_argument('-c', '--confidence', type=float, default=0.5, help='Confidence for Caffe Face detection')
+    ap.add_argument('-o', '--output', type=str, default='landmarks.npz', help='Output .npy or .npz file of the landmarks found in dataset_dir')
     args = vars(ap.parse_args())
     
-    net = DlibLandmarkDetectorImageTransformation(args['model'])
-    if args['image_source']:
-        AppController(source=args['image_source'], image_transformation=net, video=False, transformation_kw=dict(num_upsamples=args['num_upsamples']))
+    if args['face_detector'] == 'caffe':
+        face_detector = CaffeDetectorImageTransformation(args['prototxt'], args['face_model'])
+        net = CascadedFaceLandmarkImageTransformation(face_detector, args['model'])
+        transformation_kw = dict(confidence=args['confidence'])
     else:
-        AppController(source=0, image_transformation=net, transformation_kw=dict(num_upsamples=args['num_upsamples']))
\ No newline at end of file
+        net = DlibLandmarkDetectorImageTransformation(args['model'])
+        transformation_kw = dict(num_upsamples=args['num_upsamples'])
+    if args['dataset_dir']:
+        with LandmarkWriter(args['output']) as writer:
+            DatasetController(source=args['dataset_dir'], image_transformation=net, transformation_kw=transformation_kw,
+                              result_callback=lambda image_id, transformation, elapsed: writer.write(image_id, transformation.landmarks))
+    elif args['image_source']:
+        AppController(source=args['image_source'], image_transformation=net, video=False, transformation_kw=transformation_kw)
+    else:
+        AppController(source=0, image_transformation=net, transformation_kw=transformation_kw)
\ No newline at end of file
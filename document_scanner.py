@@ -5,6 +5,7 @@
 # @Last Modified time: 2022-06-20 17:52:36
 
 import argparse
+import cv2
 from models import DocumentScannerImageTransformation
 from controller import AppController
     
@@ -13,10 +14,15 @@ if __name__ == '__main__':
     ap.add_argument('-i', '--image_source', default=None, help='Path to image')
     ap.add_argument('-c', dest='smart_crop', action='store_false', help='Deactivate smart crop function.')
     ap.add_argument('-b', dest='binarization', action='store_false', help='Deactivate binarization function.')
+    ap.add_argument('-s', '--strip_height', type=int, default=None, help='Binarize pages taller than this number of rows in strips processed by a thread pool.')
+    ap.add_argument('-t', '--threads', type=int, default=None, help='Number of threads processing the strips. Defaults to the number of cores. OpenCV is limited to a single thread when strips are used, so both pools do not compete for the cores.')
+    ap.add_argument('-w', '--workers', type=int, default=None, help='Process video frames in parallel with this number of worker processes.')
     args = vars(ap.parse_args())
 
-    transformer = DocumentScannerImageTransformation()
+    if args['strip_height'] is not None:
+        cv2.setNumThreads(1)
+    transformer = DocumentScannerImageTransformation(strip_height=args['strip_height'], n_threads=args['threads'])
     if args['image_source']:
         AppController(source=args['image_source'], image_transformation=transformer, video=False, transformation_kw=dict(smart_crop=args['smart_crop'], binarization=args['binarization']))
     else:
-        AppController(source=0, image_transformation=transformer, transformation_kw=dict(smart_crop=args['smart_crop'], binarization=args['binarization']))
\ No newline at end of file
+        AppController(source=0, image_transformation=transformer, transformation_kw=dict(smart_crop=args['smart_crop'], binarization=args['binarization']), n_workers=args['workers'])
\ No newline at end of file
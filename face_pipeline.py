@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# @Author: Diogo Telheiro do Nascimento
+# @Date:   2022-06-18 20:01:57
+# @Last Modified by:   Diogo Telheiro do Nascimento
+# @Last Modified time: 2022-06-20 17:52:36
+
+import argparse
+from models import CaffeDetectorImageTransformation, DlibLandmarkDetectorImageTransformation
+from controller import PipelineGraphController
+    
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser()
+    ap.add_argument('-p', '--prototxt', type=str, default='./resource/deploy.prototxt', help='Path to prototxt file')
+    ap.add_argument('-m', '--model', type=str, default='./resource/opencv_face_detector.caffemodel', help='Path to face detector weights')
+    ap.add_argument('-l', '--landmarks_model', type=str, default='./resource/shape_predictor_68_face_landmarks.dat', help='Path to face landmarks weights')
+    ap.add_argument('-c', '--confidence', type=float, default=0.5, help='Confidence for Face detection')
+    ap.add_argument('-u', '--num_upsamples', type=int, default=1, help='Number of upsamples for Face Landmarks detection')
+    ap.add_argument('-v', '--video_source', default='0', help='Webcam index, video path or frame store directory')
+    args = vars(ap.parse_args())
+    video_source = int(args['video_source']) if args['video_source'].isdigit() else args['video_source']
+    
+    branches = {
+        'faces': CaffeDetectorImageTransformation(args['prototxt'], args['model']),
+        'landmarks': DlibLandmarkDetectorImageTransformation(args['landmarks_model'])
+    }
+    transformation_kw = {
+        'faces': dict(confidence=args['confidence']),
+        'landmarks': dict(num_upsamples=args['num_upsamples'])
+    }
+    PipelineGraphController(source=video_source, branches=branches, transformation_kw=transformation_kw)
\ No newline at end of file
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# @Author: Diogo Telheiro do Nascimento
+# @Date:   2022-06-18 20:01:57
+# @Last Modified by:   Diogo Telheiro do Nascimento
+# @Last Modified time: 2022-06-20 17:52:36
+
+import os
+import argparse
+import cv2
+from controller.frameStore import FrameStoreWriter
+    
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Decode a dataset or a video/webcam session once into a memory-mapped frame store.')
+    ap.add_argument('-o', '--output', type=str, required=True, help='Frame store directory')
+    ap.add_argument('-i', '--image_dir', default=None, help='Directory of images to be decoded')
+    ap.add_argument('-v', '--video_source', default='0', help='Webcam index or video path. Used when no image_dir is given')
+    ap.add_argument('-n', '--max_frames', type=int, default=None, help='Maximum number of frames to be stored')
+    args = vars(ap.parse_args())
+
+    with FrameStoreWriter(args['output']) as writer:
+        if args['image_dir']:
+            for image_name in sorted(os.listdir(args['image_dir'])):
+                if args['max_frames'] is not None and len(writer) >= args['max_frames']:
+                    break
+                image_path = os.path.join(args['image_dir'], image_name)
+                image = cv2.imread(image_path)
+                if image is None:
+                    continue
+                writer.write(image, timestamp=os.path.getmtime(image_path))
+        else:
+            video_source = int(args['video_source']) if args['video_source'].isdigit() else args['video_source']
+            cap = cv2.VideoCapture(video_source)
+            while args['max_frames'] is None or len(writer) < args['max_frames']:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                writer.write(frame)
+            cap.release()
+    print(f"{len(writer)} frames stored at {args['output']}")
@@ -5,4 +5,7 @@ from .documentScannerImageTransformation import DocumentScannerImageTransformati
 from .objectContourImageTransormation import ObjectContourImageTransformation
 from .objectTrackingImageTransformation import ObjectTrackingImageTransformation
 from .objectMeasureImageTransformation import ObjectMeasureImageTransformation
-from .rotationImageTransformation import RotationImageTransformation
\ No newline at end of file
+from .rotationImageTransformation import RotationImageTransformation
+from .cachedImageTransformation import CachedImageTransformation
+from .memoryProfiledImageTransformation import MemoryProfiledImageTransformation
+from .cascadedFaceLandmarkImageTransformation import CascadedFaceLandmarkImageTransformation
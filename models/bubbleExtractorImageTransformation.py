@@ -3,6 +3,7 @@ import cv2
 import numpy as np
 import numpy.typing as npt
 from .documentScannerImageTransformation import DocumentScannerImageTransformation
+from .genericTransformations import GenericTransformations
 from .interface import ImageTransformationInterface
 
 
@@ -12,6 +13,8 @@ class BubbleExtractorImageTransformation(ImageTransformationInterface):
     Args:
         answer_options (list, optional): Ordered (left to right) list of possible answers. Defaults to ['a', 'b', 'c', 'd', 'e'].
     """        
+    stateless = True
+
     def __init__(self, answer_options=['a', 'b', 'c', 'd', 'e']):
         self.__doc_scanner = DocumentScannerImageTransformation()
         self._question_cnts = []
@@ -19,34 +22,35 @@ class BubbleExtractorImageTransformation(ImageTransformationInterface):
         self.answers = {}
         self.__answer_contours = []
 
-    @staticmethod
-    def __sort_contours(pts: npt.ArrayLike, left_right: bool=True) -> npt.ArrayLike:
-        """Sort contour list from its minimum position.
+    def cache_parameters(self) -> dict:
+        return {'answer_options': list(self.__answer_options), 'doc_scanner': self.__doc_scanner.cache_parameters()}
 
-        Args:
-            pts (npt.ArrayLike): Array of contours.
-            left_right (bool, optional): Orders from left to right if True. Orders from top to bottom if False. Defaults to True.
+    def fork(self) -> 'BubbleExtractorImageTransformation':
+        """Create an instance with its own bubbles and answers to process an independent stream.
 
         Returns:
-            npt.ArrayLike: Ordered contour list.
+            BubbleExtractorImageTransformation: Transformation instance for a new stream.
         """        
-        order_element = 0 if left_right else 1
-        return sorted(pts, key=lambda x: x.min(axis=0).flatten()[order_element])
-    
+        forked = super().fork()
+        forked.__doc_scanner = self.__doc_scanner.fork()
+        forked._question_cnts = []
+        forked.answers = {}
+        forked.__answer_contours = []
+        return forked
 
     def __set_question_bubbles(self, image: npt.ArrayLike):
-        """Identify bubbles in the cart.
+        """Identify bubbles in the cart, ordered from top to bottom.
         It searches for boundingBoxes of specific minimum size and aspect ratio.
 
         Args:
             image (npt.ArrayLike): Grayscale image.
         """        
         cnts, _ = cv2.findContours(image.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for cnt in cnts:
-            x, y, w, h = cv2.boundingRect(cnt)
-            ratio = w / h
-            if w >= 15 and h >= 15 and ratio >= 0.9 and ratio <= 1.5:
-                self._question_cnts.append(cnt)
+        geometry = GenericTransformations.contour_geometry(cnts)
+        w, h = geometry.rects[:, 2], geometry.rects[:, 3]
+        ratio = geometry.aspect_ratios
+        bubbles = geometry.select((w >= 15) & (h >= 15) & (ratio >= 0.9) & (ratio <= 1.5))
+        self._question_cnts.extend(bubbles.order(bubbles.min_positions[:, 1]).contours)
 
     @staticmethod
     def __extract_answer_bubble(image: npt.ArrayLike, bubbles: npt.ArrayLike) -> Tuple[int, int]:
@@ -77,7 +81,7 @@ class BubbleExtractorImageTransformation(ImageTransformationInterface):
             n_choices (int, optional): Number of possible answers. Defaults to 5.
         """        
         for question_number, contour_row in enumerate(np.arange(0, len(self._question_cnts), n_choices), start=1):
-            left_right_bubbles = self.__sort_contours(self._question_cnts[contour_row:contour_row+n_choices])
+            left_right_bubbles = GenericTransformations.sort_contours(self._question_cnts[contour_row:contour_row+n_choices])
             _, answer_id = self.__extract_answer_bubble(image, left_right_bubbles)
             self.answers[question_number] = self.__answer_options[answer_id]
             
@@ -85,11 +89,13 @@ class BubbleExtractorImageTransformation(ImageTransformationInterface):
 
     
     def __call__(self, image: npt.ArrayLike) -> List[npt.ArrayLike]:
+        self._question_cnts = []
+        self.answers = {}
+        self.__answer_contours = []
         smart_cropped_image = self.__doc_scanner(image.copy(), binarization=False)[0]
         processed_image = cv2.cvtColor(smart_cropped_image, cv2.COLOR_BGR2GRAY)
         binary_image = cv2.threshold(processed_image, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
         self.__set_question_bubbles(binary_image)
-        self._question_cnts = self.__sort_contours(self._question_cnts, left_right=False)
         self.__set_answers(binary_image)
         smart_cropped_image = cv2.drawContours(smart_cropped_image, self.__answer_contours, -1, (0, 255, 0), 3)
         text = f"Answers: {self.answers}"
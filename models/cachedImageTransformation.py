@@ -0,0 +1,178 @@
+import os
+import copy
+import pickle
+import hashlib
+from typing import List, Tuple
+from collections import OrderedDict
+import numpy as np
+import numpy.typing as npt
+from .interface import ImageTransformationInterface
+
+
+class CachedImageTransformation(ImageTransformationInterface):
+    """Memoizes an image transformation by the content of the input image.
+    Results are keyed by a hash of the image bytes, the transformation parameters and the call arguments,
+    kept in an in-memory LRU bounded by size and optionally persisted to disk.
+    Parameters are the ones the transformation declares in `cache_parameters`, read on every call, so changing them afterwards never
+    returns stale results and keys do not depend on the order images are processed in.
+    Only stateless transformations can be cached, since a hit skips the state update of the wrapped transformation.
+
+    Args:
+        image_transformation (ImageTransformationInterface): Image Transformation pipeline to be memoized.
+        max_bytes (int, optional): Size budget of the in-memory tier. Defaults to 256 MB.
+        cache_dir (str, optional): Directory of the on-disk tier. Deactivated if None. Defaults to None.
+        result_attributes (list[str], optional): Transformation attributes holding structured results (e.g. ['answers']).
+            They are stored with the images and restored on cache hits. Defaults to [].
+
+    Raises:
+        ValueError: If the transformation is not stateless.
+    """        
+    def __init__(self, image_transformation: ImageTransformationInterface, max_bytes: int=256 * 1024 ** 2, cache_dir: str=None, result_attributes: List[str]=[]):
+        if not image_transformation.stateless:
+            raise ValueError(f"{type(image_transformation).__name__} is not stateless, its cached outputs would skip its state updates")
+        self.image_transformation = image_transformation
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.result_attributes = list(result_attributes)
+        self.__entries = OrderedDict()
+        self.__size = 0
+        self.__hits = 0
+        self.__disk_hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, image: npt.ArrayLike, kwargs: dict, parameters: dict) -> str:
+        """Hash image content, transformation parameters and call arguments.
+
+        Args:
+            image (npt.ArrayLike): Input image.
+            kwargs (dict): Extra variable arguments to the image_transformation pipeline.
+            parameters (dict): Current transformation cache parameters.
+
+        Returns:
+            str: Cache key.
+        """        
+        image = np.ascontiguousarray(image)
+        fingerprint = f"{type(self.image_transformation).__qualname__}{sorted(parameters.items())}"
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{image.shape}{image.dtype}{fingerprint}{sorted(kwargs.items())}".encode())
+        digest.update(image.data)
+        return digest.hexdigest()
+
+    def __store(self, key: str, entry: Tuple[List[npt.ArrayLike], dict]):
+        """Insert entry into the in-memory tier evicting the least recently used ones above the size budget.
+
+        Args:
+            key (str): Cache key.
+            entry (tuple[list[npt.ArrayLike], dict]): Output images and result attributes.
+        """        
+        entry_size = sum(image.nbytes for image in entry[0])
+        if entry_size > self.max_bytes:
+            return
+        self.__entries[key] = (entry, entry_size)
+        self.__size += entry_size
+        while self.__size > self.max_bytes:
+            _, (_, evicted_size) = self.__entries.popitem(last=False)
+            self.__size -= evicted_size
+            self.__evictions += 1
+
+    def __disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def __load_from_disk(self, key: str):
+        if self.cache_dir is None or not os.path.exists(self.__disk_path(key)):
+            return None
+        with open(self.__disk_path(key), 'rb') as f:
+            return pickle.load(f)
+
+    def __write_to_disk(self, key: str, entry: Tuple[List[npt.ArrayLike], dict]):
+        if self.cache_dir is None:
+            return
+        tmp_path = f"{self.__disk_path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.__disk_path(key))
+
+    def __restore(self, entry: Tuple[List[npt.ArrayLike], dict]) -> List[npt.ArrayLike]:
+        """Restore result attributes into the transformation and copy cached images, so callers may draw over them.
+
+        Args:
+            entry (tuple[list[npt.ArrayLike], dict]): Output images and result attributes.
+
+        Returns:
+            list[npt.ArrayLike]: Output images.
+        """        
+        images, results = entry
+        for name, value in results.items():
+            setattr(self.image_transformation, name, copy.deepcopy(value))
+        return [image.copy() for image in images]
+
+    @property
+    def stats(self) -> dict:
+        """Cache statistics.
+
+        Returns:
+            dict: Hits (memory and disk), misses, evictions, number of entries, memory usage and hit rate.
+        """        
+        requests = self.__hits + self.__disk_hits + self.__misses
+        return {
+            'hits': self.__hits,
+            'disk_hits': self.__disk_hits,
+            'misses': self.__misses,
+            'evictions': self.__evictions,
+            'entries': len(self.__entries),
+            'bytes': self.__size,
+            'hit_rate': (self.__hits + self.__disk_hits) / requests if requests else 0.0
+        }
+
+    @property
+    def stateless(self) -> bool:
+        """Caching keeps the statefulness of the wrapped transformation."""        
+        return self.image_transformation.stateless
+
+    @property
+    def working_resolution(self) -> Tuple[int, int]:
+        return self.image_transformation.working_resolution
+
+    def set_working_width(self, width: int):
+        self.image_transformation.set_working_width(width)
+
+    def cache_parameters(self) -> dict:
+        return self.image_transformation.cache_parameters()
+
+    def clear(self):
+        """Drop the in-memory tier. The on-disk tier is kept."""
+        self.__entries.clear()
+        self.__size = 0
+
+    def fork(self) -> 'CachedImageTransformation':
+        """Create a cache with its own in-memory tier around a forked transformation. The on-disk tier is shared.
+
+        Returns:
+            CachedImageTransformation: Transformation instance for a new stream.
+        """        
+        return CachedImageTransformation(self.image_transformation.fork(), self.max_bytes, self.cache_dir, self.result_attributes)
+
+    def __call__(self, image: npt.ArrayLike, **kwargs) -> List[npt.ArrayLike]:
+        key = self._key(image, kwargs, self.image_transformation.cache_parameters())
+
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return self.__restore(self.__entries[key][0])
+
+        entry = self.__load_from_disk(key)
+        if entry is not None:
+            self.__disk_hits += 1
+            self.__store(key, entry)
+            return self.__restore(entry)
+
+        self.__misses += 1
+        image_list = self.image_transformation(image, **kwargs)
+        results = {name: copy.deepcopy(getattr(self.image_transformation, name)) for name in self.result_attributes}
+        entry = ([np.array(output_image) for output_image in image_list], results)
+        self.__store(key, entry)
+        self.__write_to_disk(key, entry)
+        return image_list
@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Tuple
 from collections.abc import Callable
 import cv2
 import numpy as np
 import numpy.typing as npt
 from .interface import ModelInterface, ImageTransformationInterface
+from .genericTransformations import GenericTransformations
 
 class CaffeDetectorImageTransformation(ModelInterface, ImageTransformationInterface):    
     """It Loads pretrained Caffe Detector models and implements image transformation interface to identify objects in the image.
@@ -13,18 +14,64 @@ class CaffeDetectorImageTransformation(ModelInterface, ImageTransformationInterf
         model_path (str): Path to .caffemodel file containing model's weight.
         model_loader (Callable, optional): Function to load the model using prototxt and model_path files. Defaults to cv2.dnn.readNetFromCaffe.
         model_preprocess (Callable, optional): Function to preprocess images to input model. Defaults to cv2.dnn.blobFromImage.
+        tile_size (int, optional): Activates the tiled mode for frames larger than this size. Frames are split into overlapping square tiles
+            that run together with the whole frame in a single batch, so small objects in high resolution frames are not lost. Defaults to None.
+        tile_overlap (float, optional): Fraction of the tile size shared by neighbour tiles. Defaults to 0.25.
+        nms_threshold (float, optional): Intersection over Union above which detections from different tiles are merged. Defaults to 0.3.
+        backend (int, optional): Preferable cv2.dnn backend (e.g. cv2.dnn.DNN_BACKEND_OPENCV). OpenCV default if None. Defaults to None.
+        target (int, optional): Preferable cv2.dnn target (e.g. cv2.dnn.DNN_TARGET_CPU). OpenCV default if None. Defaults to None.
+        num_threads (int, optional): Threads used by OpenCV (process wide, see cv2.setNumThreads). Keep workers * num_threads below the number of cores. OpenCV default if None. Defaults to None.
+        fp16 (bool, optional): Run the target in half precision (CPU, OpenCL or CUDA), when supported by the installed OpenCV. Defaults to False.
+        input_size (tuple, optional): Width and Height frames and tiles are resized to before running through the network. Defaults to (300, 300).
     """                
+    stateless = True
+
     def __init__(self, 
                 prototxt: str, 
                 model_path: str, 
                 model_loader: Callable=cv2.dnn.readNetFromCaffe, 
-                model_preprocess: Callable=cv2.dnn.blobFromImage):
+                model_preprocess: Callable=cv2.dnn.blobFromImage,
+                tile_size: int=None,
+                tile_overlap: float=0.25,
+                nms_threshold: float=0.3,
+                backend: int=None,
+                target: int=None,
+                num_threads: int=None,
+                fp16: bool=False,
+                input_size: tuple=(300, 300)):
         self.prototxt = prototxt
         self.model_path = model_path
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.nms_threshold = nms_threshold
+        self.backend = backend
+        self.target = self._half_precision_target(target) if fp16 else target
+        self.num_threads = num_threads
+        self.input_size = tuple(input_size)
         self.__model_loader = model_loader
         self.__preprocess_func = model_preprocess
         self.load_model()
 
+    @property
+    def working_resolution(self) -> Tuple[int, int]:
+        """Frames are resized to the network input_size, unless the tiled mode needs the full resolution."""
+        return None if self.tile_size is not None else self.input_size
+
+    @working_resolution.setter
+    def working_resolution(self, working_resolution: Tuple[int, int]):
+        self.input_size = tuple(working_resolution)
+
+    def cache_parameters(self) -> dict:
+        return {
+            'prototxt': self.prototxt,
+            'model_path': self.model_path,
+            'input_size': self.input_size,
+            'tile_size': self.tile_size,
+            'tile_overlap': self.tile_overlap,
+            'nms_threshold': self.nms_threshold,
+            'backend': self.backend,
+            'target': self.target
+        }
 
     def preprocess(self, image: npt.ArrayLike, size: tuple=(300,300)) -> npt.ArrayLike:
         """Preprocesses image to loaded model
@@ -36,9 +83,7 @@ class CaffeDetectorImageTransformation(ModelInterface, ImageTransformationInterf
         Returns:
             npt.ArrayLike: Processed image.
         """        
-        prep_image = cv2.resize(image, size)
-        prep_image = self.__preprocess_func(prep_image, 1.0, size, (104.0, 177.0, 123.0))
-        return prep_image
+        return self.__preprocess_func(image, 1.0, size, (104.0, 177.0, 123.0))
     
     def predict(self, image: npt.ArrayLike, size: tuple=(300,300)) -> npt.ArrayLike:
         """Run image through loaded Caffe Object Detector.
@@ -54,8 +99,142 @@ class CaffeDetectorImageTransformation(ModelInterface, ImageTransformationInterf
         self.__model.setInput(prep_image)
         return self.__model.forward()
         
+    def __getstate__(self) -> dict:
+        """Drop the loaded network, which cannot be pickled, when sending the transformation to other processes."""        
+        state = self.__dict__.copy()
+        del state['_CaffeDetectorImageTransformation__model']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.load_model()
+
     def load_model(self):
             self.__model = self.__model_loader(self.prototxt, self.model_path)
+            if self.backend is not None:
+                self.__model.setPreferableBackend(self.backend)
+            if self.target is not None:
+                self.__model.setPreferableTarget(self.target)
+            if self.num_threads is not None:
+                cv2.setNumThreads(self.num_threads)
+
+    @staticmethod
+    def _half_precision_target(target: int=None) -> int:
+        """Find the half precision equivalent of a cv2.dnn target.
+
+        Args:
+            target (int, optional): cv2.dnn target. CPU if None. Defaults to None.
+
+        Raises:
+            ValueError: If the installed OpenCV has no half precision version of the target.
+
+        Returns:
+            int: Half precision cv2.dnn target.
+        """        
+        half_precision_targets = {
+            'DNN_TARGET_CPU': 'DNN_TARGET_CPU_FP16',
+            'DNN_TARGET_OPENCL': 'DNN_TARGET_OPENCL_FP16',
+            'DNN_TARGET_CUDA': 'DNN_TARGET_CUDA_FP16'
+        }
+        target = cv2.dnn.DNN_TARGET_CPU if target is None else target
+        for full_precision, half_precision in half_precision_targets.items():
+            if getattr(cv2.dnn, full_precision) != target:
+                continue
+            if not hasattr(cv2.dnn, half_precision):
+                raise ValueError(f"{half_precision} is not supported by OpenCV {cv2.__version__}")
+            return getattr(cv2.dnn, half_precision)
+        if target in (getattr(cv2.dnn, name, None) for name in half_precision_targets.values()):
+            return target
+        raise ValueError(f"Target {target} has no half precision version")
+
+    def layer_timings(self) -> Tuple[float, dict]:
+        """Time spent by the last forward pass in each layer of the loaded model.
+
+        Returns:
+            tuple[float, dict]: Total forward time and time of each layer name, both in milliseconds.
+        """        
+        total_ticks, layer_ticks = self.__model.getPerfProfile()
+        ms_per_tick = 1000.0 / cv2.getTickFrequency()
+        layer_names = self.__model.getLayerNames()
+        timings = {name: float(ticks) * ms_per_tick for name, ticks in zip(layer_names, np.asarray(layer_ticks).ravel())}
+        return total_ticks * ms_per_tick, timings
+
+    def layer_timings_report(self, top: int=10) -> str:
+        """Describe where the last forward pass spent its time.
+
+        Args:
+            top (int, optional): Number of slowest layers listed. Defaults to 10.
+
+        Returns:
+            str: Report with the total forward time and the slowest layers.
+        """        
+        total_ms, timings = self.layer_timings()
+        lines = [f"Forward: {total_ms:.2f} ms | threads: {cv2.getNumThreads()}"]
+        for name, layer_ms in sorted(timings.items(), key=lambda item: item[1], reverse=True)[:top]:
+            share = 100 * layer_ms / total_ms if total_ms > 0 else 0.0
+            lines.append(f"{name:<40} {layer_ms:8.2f} ms {share:5.1f}%")
+        return "\n".join(lines)
+
+    def _tile_boxes(self, h: int, w: int) -> npt.ArrayLike:
+        """Split the frame into evenly spaced overlapping tiles. The last tile of each row and column is aligned to the frame border.
+
+        Args:
+            h (int): Frame height.
+            w (int): Frame width.
+
+        Returns:
+            npt.ArrayLike: Array of (x0, y0, x1, y1) tiles, starting with the whole frame.
+        """        
+        tile = self.tile_size
+        stride = max(tile * (1 - self.tile_overlap), 1)
+        starts = [np.linspace(0, max(length - tile, 0), int(np.ceil(max(length - tile, 0) / stride)) + 1).astype("int") for length in (w, h)]
+        xx, yy = np.meshgrid(*starts)
+        x0, y0 = xx.ravel(), yy.ravel()
+        tiles = np.stack([x0, y0, np.minimum(x0 + tile, w), np.minimum(y0 + tile, h)], axis=1)
+        return np.concatenate([[[0, 0, w, h]], tiles])
+
+    def predict_tiles(self, image: npt.ArrayLike, size: tuple=(300,300)) -> Tuple[npt.ArrayLike, npt.ArrayLike]:
+        """Run the whole frame and its tiles through loaded Caffe Object Detector as a single batch.
+
+        Args:
+            image (npt.ArrayLike): Raw input image.
+            size (tuple, optional): Height and Width to resize each tile. Defaults to (300,300).
+
+        Returns:
+            tuple[npt.ArrayLike, npt.ArrayLike]: Load detector's output, whose first column is the tile index, and the (x0, y0, x1, y1) tiles.
+        """        
+        h, w, _ = image.shape
+        tiles = self._tile_boxes(h, w)
+        batch = np.concatenate([self.preprocess(image[y0:y1, x0:x1], size) for x0, y0, x1, y1 in tiles])
+        self.__model.setInput(batch)
+        return self.__model.forward(), tiles
+
+    def detect(self, image: npt.ArrayLike, confidence: float) -> Tuple[npt.ArrayLike, npt.ArrayLike]:
+        """Detect objects in absolute image coordinates, using the tiled mode for frames larger than tile_size.
+
+        Args:
+            image (npt.ArrayLike): Input image.
+            confidence (float): Considered model's confidence in detection.
+
+        Returns:
+            tuple[npt.ArrayLike, npt.ArrayLike]: (x0, y0, x1, y1) integer boxes and their confidences.
+        """        
+        h, w, _ = image.shape
+        if self.tile_size is None or max(h, w) <= self.tile_size:
+            detections = self.predict(image, self.input_size)
+            valid_detections = detections[0, 0, np.where(detections[0, 0, :, 2] > confidence)].reshape((-1, 7))
+            boxes = valid_detections[:, -4:] * np.asarray([w, h, w, h])
+            return boxes.astype("int"), valid_detections[:, 2]
+
+        detections, tiles = self.predict_tiles(image, self.input_size)
+        detections = detections.reshape((-1, 7))
+        valid_detections = detections[detections[:, 2] > confidence]
+        tile_boxes = tiles[valid_detections[:, 0].astype("int")]
+        tile_origin = tile_boxes[:, [0, 1, 0, 1]]
+        tile_shape = (tile_boxes[:, 2:] - tile_boxes[:, :2])[:, [0, 1, 0, 1]]
+        boxes = tile_origin + valid_detections[:, -4:] * tile_shape
+        keep = GenericTransformations.non_max_suppression(boxes, valid_detections[:, 2], self.nms_threshold)
+        return boxes[keep].astype("int"), valid_detections[keep, 2]
 
     def __call__(self, image: npt.ArrayLike, confidence: float) -> List[npt.ArrayLike]:
         """Abstracts whole prediction pipeline to transform input image to output image with objects detected.
@@ -67,17 +246,7 @@ class CaffeDetectorImageTransformation(ModelInterface, ImageTransformationInterf
         Returns:
             list[npt.ArrayLike]: List containing the image with all detections.
         """        
-        h, w, _ = image.shape
-        detections = self.predict(image)
-        valid_detections = detections[0, 0, np.where(detections[0, 0, :, 2] > confidence)].reshape((-1, 7))
-        
-        for detection_information in valid_detections[:, -5:]:
-            detection_confidence = detection_information[0]
-            
-            bbox_coordinates = detection_information[-4:]
-            absolute_bbox = bbox_coordinates * np.asarray([w, h, w, h])
-            x0, y0, x1, y1 = absolute_bbox.astype("int")
-            
+        for (x0, y0, x1, y1), detection_confidence in zip(*self.detect(image, confidence)):
             text = f"{detection_confidence:.2f}%"
             y = y0 - 10 if y0 - 10 > 10 else y0 + 10
             
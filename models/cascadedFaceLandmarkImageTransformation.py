@@ -0,0 +1,101 @@
+from typing import List, Tuple
+from collections.abc import Callable
+import cv2
+import dlib
+import numpy as np
+import numpy.typing as npt
+from .caffeDetectorImageTransformation import CaffeDetectorImageTransformation
+from .dlibLandmarkDetectorImageTransformation import DlibLandmarkDetectorImageTransformation
+
+
+class CascadedFaceLandmarkImageTransformation(DlibLandmarkDetectorImageTransformation):
+    """Locates face landmarks using the Caffe DNN face detector as face finder of the Dlib shape predictor, instead of the HOG detector.
+    Detected boxes are clipped to the image and handed straight to the shape predictor as dlib.rectangles. The detector reads the BGR frame
+    and the shape predictor its single grayscale conversion, so the frame is not copied nor upsampled.
+
+    Args:
+        face_detector (CaffeDetectorImageTransformation): Loaded Caffe face detector.
+        model_path (str): Path to .dat file containing the shape predictor weights.
+        confidence (float, optional): Default face detection confidence. Defaults to 0.5.
+        model_loader (Callable, optional): Function to load the shape predictor using model_path. Defaults to dlib.shape_predictor.
+    """        
+    def __init__(self,
+                face_detector: CaffeDetectorImageTransformation,
+                model_path: str,
+                confidence: float=0.5,
+                model_loader: Callable=dlib.shape_predictor):
+        self.face_detector = face_detector
+        self.confidence = confidence
+        super().__init__(model_path, model_loader=model_loader, model_preprocess=None)
+
+    def cache_parameters(self) -> dict:
+        return dict(super().cache_parameters(), confidence=self.confidence, face_detector=self.face_detector.cache_parameters())
+
+    @staticmethod
+    def _boxes_to_rectangles(boxes: npt.ArrayLike, h: int, w: int) -> dlib.rectangles:
+        """Convert (x0, y0, x1, y1) boxes into dlib rectangles clipped to the image.
+
+        Args:
+            boxes (npt.ArrayLike): Integer boxes in absolute image coordinates.
+            h (int): Image height.
+            w (int): Image width.
+
+        Returns:
+            dlib.rectangles: Face rectangles.
+        """        
+        boxes = np.clip(boxes, 0, [w - 1, h - 1, w - 1, h - 1])
+        rects = dlib.rectangles()
+        for x0, y0, x1, y1 in boxes[(boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])].tolist():
+            rects.append(dlib.rectangle(x0, y0, x1, y1))
+        return rects
+
+    def preprocess(self, image: npt.ArrayLike, confidence: float=None) -> Tuple[npt.ArrayLike, dlib.rectangles]:
+        """Detect all faces within the image with the Caffe face detector.
+
+        Args:
+            image (npt.ArrayLike): Raw image.
+            confidence (float, optional): Face detection confidence. Defaults to the confidence given to the constructor.
+
+        Returns:
+            tuple[npt.ArrayLike, dlib.rectangles]: Tuple containing the grayscale image and Rectangles containing face coordinates
+        """        
+        confidence = self.confidence if confidence is None else confidence
+        boxes, _ = self.face_detector.detect(image, confidence)
+        prep_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return prep_image, self._boxes_to_rectangles(boxes, *image.shape[:2])
+
+    def predict_landmarks(self, image: npt.ArrayLike, confidence: float=None) -> npt.ArrayLike:
+        """Locate the landmarks of every face found by the Caffe face detector.
+
+        Args:
+            image (npt.ArrayLike): Raw input image.
+            confidence (float, optional): Face detection confidence. Defaults to the confidence given to the constructor.
+
+        Returns:
+            npt.ArrayLike: (faces, num_parts, 2) int32 array of (x, y) landmark coordinates.
+        """        
+        return super().predict_landmarks(image, confidence)
+
+    def predict(self, image: npt.ArrayLike, confidence: float=None) -> npt.ArrayLike:
+        """Run image through the Caffe face detector and the loaded Face Landmarks Detector.
+
+        Args:
+            image (npt.ArrayLike): Raw input image.
+            confidence (float, optional): Face detection confidence. Defaults to the confidence given to the constructor.
+
+        Returns:
+            npt.ArrayLike: Image with all landmarks.
+        """        
+        return super().predict(image, confidence)
+
+    def __call__(self, image: npt.ArrayLike, confidence: float=None) -> List[npt.ArrayLike]:
+        """Abstracts whole prediction pipeline to transform input image to output image with face landmarks.
+
+        Args:
+            image (npt.ArrayLike): Input image.
+            confidence (float, optional): Face detection confidence. Defaults to the confidence given to the constructor.
+
+        Returns:
+            list[npt.ArrayLike]: List containing the image with all landmarks.
+        """        
+        return [self.predict(image, confidence)]
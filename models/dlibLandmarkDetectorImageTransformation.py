@@ -1,4 +1,5 @@
 from typing import List, Tuple
+from itertools import chain
 from collections.abc import Callable
 import cv2
 import dlib
@@ -14,6 +15,8 @@ class DlibLandmarkDetectorImageTransformation(ModelInterface, ImageTransformatio
         model_loader (Callable, optional): Function to load the model using prototxt and model_path files. Defaults to cv2.dnn.readNetFromCaffe.
         model_preprocess (Callable, optional): Function to preprocess images to input model. Defaults to cv2.dnn.blobFromImage.
     """                
+    stateless = True
+
     def __init__(self, 
                 model_path: str, 
                 model_loader: Callable=dlib.shape_predictor, 
@@ -21,9 +24,13 @@ class DlibLandmarkDetectorImageTransformation(ModelInterface, ImageTransformatio
         self.model_path = model_path
         self.__model_loader = model_loader
         self.__preprocess_func = model_preprocess
+        self.landmarks = np.zeros((0, 68, 2), dtype=np.int32)
         self.load_model()
 
 
+    def cache_parameters(self) -> dict:
+        return {'model_path': self.model_path}
+
     @staticmethod
     def _get_point_coordinates(pt: dlib.point) -> Tuple[int]:
         """Extract (x, y) coordinates from point object.
@@ -63,6 +70,59 @@ class DlibLandmarkDetectorImageTransformation(ModelInterface, ImageTransformatio
         recs = self.__preprocess_func(prep_image, num_upsamples)
         return prep_image, recs
     
+    @staticmethod
+    def _shape_to_array(shape: dlib.full_object_detection, out: npt.ArrayLike) -> npt.ArrayLike:
+        """Copy the landmark coordinates of a shape into a preallocated int32 array, without building intermediate lists.
+
+        Args:
+            shape (dlib.full_object_detection): Shape predicted for a face.
+            out (npt.ArrayLike): (num_parts, 2) int32 array.
+
+        Returns:
+            npt.ArrayLike: The filled out array.
+        """        
+        coordinates = chain.from_iterable((pt.x, pt.y) for pt in shape.parts())
+        out.reshape(-1)[:] = np.fromiter(coordinates, dtype=np.int32, count=out.size)
+        return out
+
+    def predict_landmarks(self, image: npt.ArrayLike, num_upsamples: int=1) -> npt.ArrayLike:
+        """Locate the landmarks of every face in the image.
+
+        Args:
+            image (npt.ArrayLike): Raw input image.
+            num_upsamples (int, optional): Number of Upsample processes over image. Defaults to 1.
+
+        Returns:
+            npt.ArrayLike: (faces, num_parts, 2) int32 array of (x, y) landmark coordinates.
+        """        
+        processed_img, recs = self.preprocess(image, num_upsamples)
+        shapes = [self.__model(processed_img, rec) for rec in recs]
+        num_parts = shapes[0].num_parts if shapes else self.landmarks.shape[1]
+        landmarks = np.empty((len(shapes), num_parts, 2), dtype=np.int32)
+        for shape, face_landmarks in zip(shapes, landmarks):
+            self._shape_to_array(shape, face_landmarks)
+        return landmarks
+
+    @staticmethod
+    def _draw_points(image: npt.ArrayLike, pts: npt.ArrayLike, radius: int=1, color: tuple=(0, 0, 255)):
+        """Draw filled circles at all points with a single fancy indexing assignment.
+        The circle footprint is rasterized once with cv2.circle, so the result matches drawing each circle.
+
+        Args:
+            image (npt.ArrayLike): BGR image.
+            pts (npt.ArrayLike): (..., 2) array of (x, y) coordinates.
+            radius (int, optional): Circle radius. Defaults to 1.
+            color (tuple, optional): BGR color. Defaults to (0, 0, 255).
+        """        
+        footprint = np.zeros((2 * radius + 1, 2 * radius + 1), dtype=np.uint8)
+        cv2.circle(footprint, (radius, radius), radius, 255, -1)
+        offsets = np.argwhere(footprint)[:, ::-1] - radius
+
+        h, w = image.shape[:2]
+        pixels = (np.asarray(pts).reshape(-1, 1, 2) + offsets).reshape(-1, 2)
+        pixels = pixels[(pixels[:, 0] >= 0) & (pixels[:, 0] < w) & (pixels[:, 1] >= 0) & (pixels[:, 1] < h)]
+        image[pixels[:, 1], pixels[:, 0]] = color
+
     def predict(self, image: npt.ArrayLike, num_upsamples: int=1) -> npt.ArrayLike:
         """Run image through loaded Face Landmarks Detector.
 
@@ -74,15 +134,20 @@ class DlibLandmarkDetectorImageTransformation(ModelInterface, ImageTransformatio
         Returns:
             npt.ArrayLike: Load detector's output
         """        
-        processed_img, recs = self.preprocess(image, num_upsamples)
-        for idx, rec in enumerate(recs):
-            shape = self.__model(processed_img, rec)
-            shape_array = np.asarray([self._get_point_coordinates(pt) for pt in shape.parts()])
-            
-            for x, y in shape_array:
-                cv2.circle(image, (x, y), 1, (0, 0, 255), -1)
+        self.landmarks = self.predict_landmarks(image, num_upsamples)
+        self._draw_points(image, self.landmarks)
         return image
         
+    def __getstate__(self) -> dict:
+        """Drop the loaded shape predictor when sending the transformation to other processes."""        
+        state = self.__dict__.copy()
+        del state['_DlibLandmarkDetectorImageTransformation__model']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.load_model()
+
     def load_model(self):
             self.__model = self.__model_loader(self.model_path)
 
@@ -1,29 +1,57 @@
-from typing import Union, List
+import os
+from typing import Union, List, Tuple
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 import numpy.typing as npt
 from .objectContourImageTransormation import ObjectContourImageTransformation
+from .genericTransformations import GenericTransformations, ContourGeometry
 from .interface import ModelInterface, ImageTransformationInterface
 
 
 class DocumentScannerImageTransformation(ImageTransformationInterface):
     """Computer Vision Document Scanner Image Transformation.
+    Very large pages can be binarized in horizontal strips processed concurrently by a thread pool, created once per instance. Each strip
+    reads a halo of blockSize // 2 rows, so the stitched page is bit-identical to the single call. OpenCV also runs each strip on its own
+    thread pool, so limit it with cv2.setNumThreads(1) when the strips already use all the cores.
+    Warping is kept as a single cv2.warpPerspective call, which OpenCV already splits into row stripes over its own thread pool (see cv2.setNumThreads).
+    Warping strips with translated matrices changes the rounding of source coordinates, and pixels on exact ties differed from the single call.
+
+    Args:
+        strip_height (int, optional): Activates the tiled binarization for pages taller than this number of rows. Defaults to None.
+        n_threads (int, optional): Number of threads of the tiled mode. Defaults to the number of cores.
     """    
+    stateless = True
+    threshold_block_size = 11
+    threshold_c = 10
     
-    def __init__(self):
+    def __init__(self, strip_height: int=None, n_threads: int=None):
         self._int_points = None
+        self.strip_height = strip_height
+        self.n_threads = n_threads or os.cpu_count()
+        self.__executor = None
+
+    def __getstate__(self) -> dict:
+        """Drop the strips thread pool, which cannot be pickled, when sending the transformation to other processes."""        
+        state = self.__dict__.copy()
+        state['_DocumentScannerImageTransformation__executor'] = None
+        return state
     
-    def __find_rectangle_contour(self, cnts: npt.ArrayLike) -> Union[npt.ArrayLike, None]:
+    def cache_parameters(self) -> dict:
+        """Binarization parameters. Strips and threads do not change the outputs."""
+        return {'threshold_block_size': self.threshold_block_size, 'threshold_c': self.threshold_c}
+
+    def __find_rectangle_contour(self, geometry: ContourGeometry) -> Union[npt.ArrayLike, None]:
         """Simplify contour pts and iterate over them searching for a possible rectangle shape (4 pts).add()
 
         Args:
-            cnts (npt.ArrayLike): Contour points array.
+            geometry (ContourGeometry): Contours and their perimeters.
 
         Returns:
             Union[npt.ArrayLike, None]: (top-left, top-right, bottom-right, bottom-left). coordinates. Or None if no coordinates found
         """        
-        for cnt in cnts:
-            perimeter = cv2.arcLength(cnt, True)
+        for cnt, perimeter in zip(geometry.contours, geometry.perimeters):
             approx_poly_coords = cv2.approxPolyDP(cnt, 0.02*perimeter, True)
             if len(approx_poly_coords) == 4:
                 approx_poly_coords = approx_poly_coords.reshape(4, 2)
@@ -63,10 +91,35 @@ class DocumentScannerImageTransformation(ImageTransformationInterface):
         canny_gray = cv2.cvtColor(canny_color, cv2.COLOR_BGR2GRAY)
 
         cnts = cv2.findContours(canny_gray, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
-        cnts = sorted(cnts[0], key=cv2.contourArea, reverse=True)
+        geometry = GenericTransformations.contour_geometry(cnts[0])
 
-        self._int_points = self.__find_rectangle_contour(cnts)
+        self._int_points = self.__find_rectangle_contour(geometry.order(geometry.areas, reverse=True))
     
+    def _strips(self, height: int) -> List[Tuple[int, int]]:
+        """Split rows into strips of strip_height rows.
+
+        Args:
+            height (int): Number of rows.
+
+        Returns:
+            list[tuple[int, int]]: (first row, last row + 1) of each strip. A single strip if the tiled mode is deactivated.
+        """        
+        if self.strip_height is None or height <= self.strip_height:
+            return [(0, height)]
+        return [(y0, min(y0 + self.strip_height, height)) for y0 in range(0, height, self.strip_height)]
+
+    def _process_strips(self, strips: List[Tuple[int, int]], process_strip: Callable):
+        """Run process_strip(y0, y1) over all strips concurrently.
+
+        Args:
+            strips (list[tuple[int, int]]): Strips rows.
+            process_strip (Callable): Function writing the output rows of a strip.
+        """        
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.n_threads)
+        for future in [self.__executor.submit(process_strip, y0, y1) for y0, y1 in strips]:
+            future.result()
+
     def _generate_perspective_transformation(self, image: npt.ArrayLike) -> npt.ArrayLike:
         """Apply top-down "birds eye view" perspective transformation.
         It frames nicelly the document.
@@ -106,8 +159,22 @@ class DocumentScannerImageTransformation(ImageTransformationInterface):
         Returns:
             npt.ArrayLike: Grayscale Binarized Image
         """        
-        gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        return cv2.adaptiveThreshold(gray_image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 10)
+        def binarize(rows: npt.ArrayLike) -> npt.ArrayLike:
+            gray_rows = cv2.cvtColor(rows, cv2.COLOR_BGR2GRAY)
+            return cv2.adaptiveThreshold(gray_rows, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, self.threshold_block_size, self.threshold_c)
+
+        height = image.shape[0]
+        strips = self._strips(height)
+        if len(strips) == 1:
+            return binarize(image)
+
+        halo = self.threshold_block_size // 2
+        binary_image = np.empty(image.shape[:2], dtype=np.uint8)
+        def binarize_strip(y0: int, y1: int):
+            top, bottom = max(y0 - halo, 0), min(y1 + halo, height)
+            binary_image[y0:y1] = binarize(image[top:bottom])[y0 - top:y1 - top]
+        self._process_strips(strips, binarize_strip)
+        return binary_image
 
     def __call__(self, image: npt.ArrayLike, smart_crop=True, binarization=True) -> List[npt.ArrayLike]:
         """Apply Document Scanner effect to image.
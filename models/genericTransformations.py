@@ -1,7 +1,99 @@
+from typing import List
 import cv2
 import numpy as np
 from numpy import typing as npt
 
+
+class ContourGeometry():
+    """Geometry of a list of contours computed for all of them at once over their concatenated points.
+    Results are packed into arrays aligned with `contours`, so contours can be filtered and ordered with array operations.
+
+    Args:
+        cnts (list[npt.ArrayLike]): Contours as returned by cv2.findContours.
+
+    Attributes:
+        contours (list[npt.ArrayLike]): Input contours.
+        areas (npt.ArrayLike): Area of each contour, same as cv2.contourArea.
+        perimeters (npt.ArrayLike): Closed perimeter of each contour, same as cv2.arcLength(cnt, True).
+        rects (npt.ArrayLike): (x, y, w, h) bounding rectangle of each contour, same as cv2.boundingRect.
+        centroids (npt.ArrayLike): (x, y) centroid of each contour, same as the cv2.moments ratios. Degenerated contours use the mean point.
+        min_positions (npt.ArrayLike): Minimum (x, y) coordinates of each contour.
+    """        
+    def __init__(self, cnts: List[npt.ArrayLike]):
+        self.contours = list(cnts)
+        n_contours = len(self.contours)
+        if n_contours == 0:
+            self.areas, self.perimeters = np.zeros(0), np.zeros(0)
+            self.rects, self.min_positions = np.zeros((0, 4), dtype=np.int32), np.zeros((0, 2), dtype=np.int32)
+            self.centroids = np.zeros((0, 2))
+            return
+
+        lengths = np.fromiter(map(len, self.contours), dtype=np.intp, count=n_contours)
+        starts = np.zeros(n_contours, dtype=np.intp)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        pts = np.concatenate(self.contours).reshape(-1, 2)
+        x, y = pts[:, 0].astype(np.float64), pts[:, 1].astype(np.float64)
+
+        next_idx = np.arange(1, len(pts) + 1)
+        next_idx[starts + lengths - 1] = starts
+        x_next, y_next = x[next_idx], y[next_idx]
+
+        cross = x * y_next - x_next * y
+        signed_areas = 0.5 * np.add.reduceat(cross, starts)
+        self.areas = np.abs(signed_areas)
+        self.perimeters = np.add.reduceat(np.hypot(x_next - x, y_next - y), starts)
+
+        x_min, y_min = np.minimum.reduceat(pts[:, 0], starts), np.minimum.reduceat(pts[:, 1], starts)
+        x_max, y_max = np.maximum.reduceat(pts[:, 0], starts), np.maximum.reduceat(pts[:, 1], starts)
+        self.min_positions = np.stack([x_min, y_min], axis=1)
+        self.rects = np.stack([x_min, y_min, x_max - x_min + 1, y_max - y_min + 1], axis=1)
+
+        m10 = np.add.reduceat((x + x_next) * cross, starts) / 6
+        m01 = np.add.reduceat((y + y_next) * cross, starts) / 6
+        mean_pts = np.stack([np.add.reduceat(x, starts), np.add.reduceat(y, starts)], axis=1) / lengths[:, None]
+        degenerated = np.abs(signed_areas) < 1e-9
+        safe_areas = np.where(degenerated, 1.0, signed_areas)
+        self.centroids = np.where(degenerated[:, None], mean_pts, np.stack([m10, m01], axis=1) / safe_areas[:, None])
+
+    def __len__(self) -> int:
+        return len(self.contours)
+
+    @property
+    def aspect_ratios(self) -> npt.ArrayLike:
+        """Width / height ratio of each bounding rectangle."""        
+        return self.rects[:, 2] / self.rects[:, 3]
+
+    def select(self, indexes: npt.ArrayLike) -> 'ContourGeometry':
+        """Select contours, and their geometry, by a boolean mask or an array of indexes.
+
+        Args:
+            indexes (npt.ArrayLike): Boolean mask or indexes.
+
+        Returns:
+            ContourGeometry: Selected contours.
+        """        
+        indexes = np.asarray(indexes)
+        indexes = np.flatnonzero(indexes) if indexes.dtype == bool else indexes.astype(np.intp)
+        selected = ContourGeometry.__new__(ContourGeometry)
+        selected.contours = [self.contours[idx] for idx in indexes]
+        for name in ('areas', 'perimeters', 'rects', 'centroids', 'min_positions'):
+            setattr(selected, name, getattr(self, name)[indexes])
+        return selected
+
+    def order(self, key: npt.ArrayLike, reverse: bool=False) -> 'ContourGeometry':
+        """Stable ordering of the contours by a key array (e.g. areas or min_positions[:, 0]).
+
+        Args:
+            key (npt.ArrayLike): One value per contour.
+            reverse (bool, optional): Decreasing order if True. Defaults to False.
+
+        Returns:
+            ContourGeometry: Ordered contours.
+        """        
+        key = np.asarray(key)
+        return self.select(np.argsort(-key if reverse else key, kind='stable'))
+
+
 class GenericTransformations():
     @staticmethod
     def smart_resize(image: npt.ArrayLike, size: int=500, height: bool=True) -> npt.ArrayLike:
@@ -25,6 +117,18 @@ class GenericTransformations():
             new_h = int(h * (new_w / w))
         return cv2.resize(image, (new_w, new_h))
         
+    @staticmethod
+    def contour_geometry(cnts: List[npt.ArrayLike]) -> ContourGeometry:
+        """Compute areas, perimeters, bounding rectangles, centroids and minimum positions of all contours at once.
+
+        Args:
+            cnts (list[npt.ArrayLike]): Contours as returned by cv2.findContours.
+
+        Returns:
+            ContourGeometry: Packed contour geometry.
+        """        
+        return ContourGeometry(cnts)
+
     @staticmethod
     def sort_contours(pts: npt.ArrayLike, left_right: bool=True) -> npt.ArrayLike:
         """Sort contour list from its minimum position.
@@ -37,7 +141,8 @@ class GenericTransformations():
             npt.ArrayLike: Ordered contour list.
         """        
         order_element = 0 if left_right else 1
-        return sorted(pts, key=lambda x: x.min(axis=0).flatten()[order_element])
+        geometry = ContourGeometry(pts)
+        return geometry.order(geometry.min_positions[:, order_element]).contours
 
     @staticmethod
     def sort_rectangle_pts(pts: npt.ArrayLike) -> npt.ArrayLike:
@@ -60,4 +165,33 @@ class GenericTransformations():
         rect[1] = pts[np.argmin(diff)]
         rect[3] = pts[np.argmax(diff)]
         
-        return rect
\ No newline at end of file
+        return rect
+
+    @staticmethod
+    def non_max_suppression(boxes: npt.ArrayLike, scores: npt.ArrayLike, overlap_threshold: float=0.3) -> npt.ArrayLike:
+        """Greedy Non-Maximum Suppression, comparing each kept box against all remaining boxes at once.
+            Based on the vectorized implementation in https://pyimagesearch.com/2015/02/16/faster-non-maximum-suppression-python/
+
+        Args:
+            boxes (npt.ArrayLike): Array of (x0, y0, x1, y1) boxes.
+            scores (npt.ArrayLike): Confidence of each box.
+            overlap_threshold (float, optional): Boxes overlapping a kept box above this Intersection over Union are suppressed. Defaults to 0.3.
+
+        Returns:
+            npt.ArrayLike: Indexes of the kept boxes, ordered by decreasing score.
+        """        
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        x0, y0, x1, y1 = boxes.T
+        areas = np.maximum(x1 - x0, 0) * np.maximum(y1 - y0, 0)
+        order = np.argsort(scores)[::-1]
+
+        keep = []
+        while order.size > 0:
+            best, order = order[0], order[1:]
+            keep.append(best)
+            inter_w = np.maximum(np.minimum(x1[best], x1[order]) - np.maximum(x0[best], x0[order]), 0)
+            inter_h = np.maximum(np.minimum(y1[best], y1[order]) - np.maximum(y0[best], y0[order]), 0)
+            intersection = inter_w * inter_h
+            iou = intersection / np.maximum(areas[best] + areas[order] - intersection, 1e-6)
+            order = order[iou <= overlap_threshold]
+        return np.asarray(keep, dtype=np.int64)
@@ -1,10 +1,47 @@
+import copy
 from abc import ABC, abstractmethod
 import numpy.typing as npt
 
 class ImageTransformationInterface(ABC):
     """Image transformation interface supported throughout this project.
     Use it to create any image transformation pipeline to be applied into default Controllers.
+    Transformations whose outputs depend only on the current frame must set `stateless` to True, allowing controllers to process frames in parallel.
+    Transformations that downsize their inputs should declare the (width, height) they work on in `working_resolution`, with 0 for a side
+    following the aspect ratio, so loaders can decode images at a reduced resolution. None means the full resolution is used.
+    Controllers may change the working resolution at runtime through `set_working_width`.
     """        
+    stateless = False
+    working_resolution = None
+
     @abstractmethod
     def __call__(self, image: npt.ArrayLike, **kwargs) -> npt.ArrayLike:
-        pass
\ No newline at end of file
+        pass
+
+    def set_working_width(self, width: int):
+        """Change the width the transformation works on, keeping the aspect of its working_resolution.
+        Only transformations declaring a working_resolution support it.
+
+        Args:
+            width (int): New working width.
+        """        
+        w, h = self.working_resolution
+        self.working_resolution = (width, max(int(round(h * width / w)), 1) if h else 0)
+
+    def cache_parameters(self) -> dict:
+        """Parameters the outputs depend on besides the input image and the call arguments, used to key cached results.
+        Transformations configured through constructor arguments must override it.
+
+        Returns:
+            dict: Parameter values by name, built from plain values (numbers, strings, tuples, lists and dicts).
+        """        
+        return {}
+
+    def fork(self) -> 'ImageTransformationInterface':
+        """Create an instance to process an independent stream.
+        Loaded models are shared with the original instance while per-stream state must not be.
+        Default implementation is a shallow copy, stateful transformations must override it.
+
+        Returns:
+            ImageTransformationInterface: Transformation instance for a new stream.
+        """        
+        return copy.copy(self)
\ No newline at end of file
@@ -0,0 +1,141 @@
+import json
+import tracemalloc
+from collections import deque
+from typing import List, Tuple
+import numpy as np
+import numpy.typing as npt
+from .interface import ImageTransformationInterface
+
+
+class MemoryProfiledImageTransformation(ImageTransformationInterface):
+    """Instruments the memory used by an image transformation on each frame, flagging transformations whose retained memory grows with the frame count.
+    Python and NumPy allocations are traced with tracemalloc (it slows the pipeline down, so use it in soak tests rather than in production).
+    Besides the traced allocations, the NumPy buffers reachable from the transformation attributes are accounted, pointing which attribute is growing.
+
+    Args:
+        image_transformation (ImageTransformationInterface): Image Transformation pipeline to be instrumented.
+        warmup (int, optional): Number of initial frames ignored by the growth analysis (caches and lazy initializations). Defaults to 10.
+        growth_threshold (float, optional): Retained bytes per frame from which the transformation is flagged as leaking. Defaults to 1024.
+    """        
+    def __init__(self, image_transformation: ImageTransformationInterface, warmup: int=10, growth_threshold: float=1024):
+        self.image_transformation = image_transformation
+        self.warmup = warmup
+        self.growth_threshold = growth_threshold
+        self.frames = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def stateless(self) -> bool:
+        return self.image_transformation.stateless
+
+    @property
+    def working_resolution(self) -> Tuple[int, int]:
+        return self.image_transformation.working_resolution
+
+    def set_working_width(self, width: int):
+        self.image_transformation.set_working_width(width)
+
+    def cache_parameters(self) -> dict:
+        return self.image_transformation.cache_parameters()
+
+    def fork(self) -> 'MemoryProfiledImageTransformation':
+        """Instrument a forked transformation with its own frame records, so the growth of each stream is analyzed apart.
+
+        Returns:
+            MemoryProfiledImageTransformation: Transformation instance for a new stream.
+        """        
+        return MemoryProfiledImageTransformation(self.image_transformation.fork(), self.warmup, self.growth_threshold)
+
+    @staticmethod
+    def _state_numpy_bytes(obj, visited: set=None) -> int:
+        """Sum the bytes of NumPy buffers reachable from an object through attributes and containers.
+
+        Args:
+            obj (Any): Inspected object.
+            visited (set, optional): Ids of the objects already inspected. Defaults to None.
+
+        Returns:
+            int: Number of bytes held by NumPy arrays.
+        """        
+        visited = set() if visited is None else visited
+        if id(obj) in visited:
+            return 0
+        visited.add(id(obj))
+
+        if isinstance(obj, np.ndarray):
+            return obj.nbytes if obj.base is None else MemoryProfiledImageTransformation._state_numpy_bytes(obj.base, visited)
+        if isinstance(obj, dict):
+            children = list(obj.values())
+        elif isinstance(obj, (list, tuple, deque, set)):
+            children = list(obj)
+        elif isinstance(obj, ImageTransformationInterface):
+            children = list(vars(obj).values())
+        else:
+            return 0
+        return sum(MemoryProfiledImageTransformation._state_numpy_bytes(child, visited) for child in children)
+
+    def _attribute_numpy_bytes(self) -> dict:
+        """NumPy bytes held by each attribute of the instrumented transformation."""
+        return {name: self._state_numpy_bytes(value) for name, value in vars(self.image_transformation).items()}
+
+    def __call__(self, image: npt.ArrayLike, **kwargs) -> List[npt.ArrayLike]:
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        image_list = self.image_transformation(image, **kwargs)
+        end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+        output_bytes = sum(output.nbytes for output in image_list if not np.may_share_memory(output, image))
+        self.frames.append({
+            'peak_bytes': peak_bytes - start_bytes,
+            'net_bytes': end_bytes - start_bytes - output_bytes,
+            'output_bytes': output_bytes,
+            'state_numpy_bytes': self._state_numpy_bytes(self.image_transformation)
+        })
+        return image_list
+
+    @staticmethod
+    def _growth_per_frame(values: npt.ArrayLike) -> float:
+        """Slope of the least squares line fitted to a series, in units per frame."""
+        if len(values) < 2:
+            return 0.0
+        return float(np.polyfit(np.arange(len(values)), values, 1)[0])
+
+    def report(self) -> dict:
+        """Summarize the memory used by the instrumented transformation.
+
+        Returns:
+            dict: Peak and net bytes per frame, growth of the retained memory and of the NumPy state per frame, and the leak verdict.
+        """        
+        frames = self.frames[self.warmup:]
+        peak_bytes = np.asarray([frame['peak_bytes'] for frame in frames], dtype=np.float64)
+        net_bytes = np.asarray([frame['net_bytes'] for frame in frames], dtype=np.float64)
+        state_bytes = np.asarray([frame['state_numpy_bytes'] for frame in frames], dtype=np.float64)
+
+        retained_growth = self._growth_per_frame(np.cumsum(net_bytes))
+        state_growth = self._growth_per_frame(state_bytes)
+        return {
+            'transformation': type(self.image_transformation).__name__,
+            'frames': len(self.frames),
+            'analyzed_frames': len(frames),
+            'peak_bytes_max': float(peak_bytes.max()) if len(frames) else 0.0,
+            'peak_bytes_mean': float(peak_bytes.mean()) if len(frames) else 0.0,
+            'net_bytes_mean': float(net_bytes.mean()) if len(frames) else 0.0,
+            'retained_growth_per_frame': retained_growth,
+            'state_numpy_growth_per_frame': state_growth,
+            'state_numpy_bytes': self._attribute_numpy_bytes(),
+            'leaking': max(retained_growth, state_growth) > self.growth_threshold
+        }
+
+    def is_leaking(self) -> bool:
+        """Check if the retained memory grows faster than growth_threshold bytes per frame."""
+        return self.report()['leaking']
+
+    def write_report(self, path: str):
+        """Write the memory report as JSON.
+
+        Args:
+            path (str): Output file path.
+        """        
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=4)
@@ -8,6 +8,7 @@ from .interface import ModelInterface, ImageTransformationInterface
 class ObjectContourImageTransformation(ImageTransformationInterface):
     """It implements image transformation interface to extract contour from image.
     """        
+    stateless = True
 
     def __call__(self, image: npt.ArrayLike, lower_threshold: int=30, higher_threshold: int=155) -> List[npt.ArrayLike]:
         gray_image = cv2.cvtColor(image.copy(), cv2.COLOR_BGR2GRAY)
@@ -9,9 +9,16 @@ from .genericTransformations import GenericTransformations
 
 class ObjectMeasureImageTransformation(ImageTransformationInterface):
     """It measures all objects in the image based on a known size from the object at the left.
+    The cm/pixel ratio is taken from the leftmost object of each image.
+    Measured widths and heights of the last image are kept in `measurements`, ordered from left to right.
+
+    Args:
+        working_width (int, optional): Width images are resized to before measuring. Defaults to 600.
     """        
-    def __init__(self):
+    def __init__(self, working_width: int=600):
+        self.working_resolution = (working_width, 0)
         self._pixel_ratio = None
+        self.measurements = []
 
     @staticmethod
     def _get_middle(ptA: npt.ArrayLike, ptB: npt.ArrayLike) -> npt.ArrayLike:
@@ -118,13 +125,16 @@ class ObjectMeasureImageTransformation(ImageTransformationInterface):
 
         measured_w = self._measure_object(image, (tlblX, tlblY), (trbrX, trbrY))
         measured_h = self._measure_object(image, (tltrX, tltrY), (blbrX, blbrY))
+        self.measurements.append({'width': measured_w, 'height': measured_h})
 
         cv2.putText(image, "{:.1f}cm".format(measured_w), (int(trbrX + 10), int(trbrY)), cv2.FONT_HERSHEY_SIMPLEX, 0.65, (255, 255, 255), 2)
         cv2.putText(image, "{:.1f}cm".format(measured_h), (int(tltrX - 15), int(tltrY - 10)), cv2.FONT_HERSHEY_SIMPLEX, 0.65, (255, 255, 255), 2)
         
 
     def __call__(self, image: npt.ArrayLike, known_size: float=10.0, width=False) -> List[npt.ArrayLike]:
-        image = GenericTransformations.smart_resize(image, size=600, height=False)
+        self._pixel_ratio = None
+        self.measurements = []
+        image = GenericTransformations.smart_resize(image, size=self.working_resolution[0], height=False)
         processed_image = cv2.GaussianBlur(image, (7, 7), 1)
         processed_image = cv2.erode(processed_image, None, iterations=1)
         edges_image = ObjectContourImageTransformation()(processed_image)[0]
@@ -133,12 +143,11 @@ class ObjectMeasureImageTransformation(ImageTransformationInterface):
         
 
         cnts, _ = cv2.findContours(gray_scaled_edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        sorted_cnts = GenericTransformations.sort_contours(cnts)
+        geometry = GenericTransformations.contour_geometry(cnts)
+        geometry = geometry.select(geometry.areas >= 100)
+        sorted_cnts = geometry.order(geometry.min_positions[:, 0]).contours
         
         for contour in sorted_cnts:
-            if cv2.contourArea(contour) < 100:
-                continue
-        
             box = self.__extract_rectangles(contour)
             cv2.drawContours(image, [box], -1, (255, 130, 0), 2)
             self.__draw_at_vertices(image, box)
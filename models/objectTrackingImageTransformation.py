@@ -3,6 +3,7 @@ import cv2
 import numpy as np
 from numpy import typing as npt
 from .interface import ImageTransformationInterface
+from .genericTransformations import GenericTransformations
 
 
 class ObjectTrackingImageTransformation(ImageTransformationInterface):
@@ -12,14 +13,27 @@ class ObjectTrackingImageTransformation(ImageTransformationInterface):
         buffer_size (int, optional): Size of the buffer, Defines trace lenght. Defaults to 64.
         hsv_min (tuple, optional): Minimum HSV identified. Defaults to (115, 33, 65).
         hsv_max (tuple, optional): Maximum HSV identified. Defaults to (174, 174, 248).
+        working_width (int, optional): Width frames are resized to before tracking. Defaults to 500.
     """        
-    def __init__(self, buffer_size: int=64, hsv_min=(115, 33, 65), hsv_max=(174, 174, 248)):
+    def __init__(self, buffer_size: int=64, hsv_min=(115, 33, 65), hsv_max=(174, 174, 248), working_width: int=500):
         self.__buffer_size = buffer_size
         self.__buffer = deque(maxlen=buffer_size)
+        self.__buffer_width = working_width
+        self.working_resolution = (working_width, 0)
         self._hsv_range = {
             'min': hsv_min,
             'max': hsv_max
         }
+
+    def fork(self) -> 'ObjectTrackingImageTransformation':
+        """Create an instance with its own trace buffer to track objects in an independent stream.
+
+        Returns:
+            ObjectTrackingImageTransformation: Transformation instance for a new stream.
+        """        
+        forked = super().fork()
+        forked.__buffer = deque(maxlen=self.__buffer_size)
+        return forked
     
     def __smart_resize(self, image: npt.ArrayLike, size: int=500, height: bool=True) -> npt.ArrayLike:
         """Apply aspect ratio resizing.
@@ -76,15 +90,26 @@ class ObjectTrackingImageTransformation(ImageTransformationInterface):
             image (npt.ArrayLike): BGR image.
             cnts (npt.ArrayLike): Contours Array.
         """        
-        larger_cnt = max(cnts, key=cv2.contourArea)
-        (x, y), radius = cv2.minEnclosingCircle(larger_cnt)
-        M = cv2.moments(larger_cnt)
-        center = (int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"]))
+        geometry = GenericTransformations.contour_geometry(cnts)
+        larger_idx = int(np.argmax(geometry.areas))
+        (x, y), radius = cv2.minEnclosingCircle(geometry.contours[larger_idx])
+        center = tuple(int(coordinate) for coordinate in geometry.centroids[larger_idx])
         if radius > 10:
             cv2.circle(image, (int(x), int(y)), int(radius), (0, 0, 255), 4)
             cv2.circle(image, center, 5, (0, 255, 255), -1)
         self.__buffer.appendleft(center)
 
+    def _rescale_buffer(self, width: int):
+        """Map the trace buffer to a new working width, so the trace keeps its position when the working resolution changes.
+
+        Args:
+            width (int): New working width.
+        """        
+        ratio = width / self.__buffer_width
+        self.__buffer = deque((tuple(int(coordinate * ratio) for coordinate in center) if center is not None else None for center in self.__buffer),
+                              maxlen=self.__buffer_size)
+        self.__buffer_width = width
+
     def _draw_buffer_line_trace(self, image: npt.ArrayLike):
         """Uses the buffer to draw the object's center trace line.
 
@@ -100,7 +125,10 @@ class ObjectTrackingImageTransformation(ImageTransformationInterface):
     def __call__(self, image: npt.ArrayLike):
         center = None
         
-        resized_image = self.__smart_resize(image, 500, height=False)
+        width = self.working_resolution[0]
+        if width != self.__buffer_width:
+            self._rescale_buffer(width)
+        resized_image = self.__smart_resize(image, width, height=False)
         processed_image = self._preprocess_image(resized_image)
         mask = self._search_image_for_setted_hsv_range(processed_image)
         
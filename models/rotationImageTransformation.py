@@ -11,9 +11,14 @@ class RotationImageTransformation(ImageTransformationInterface):
     Args:
         degrees_list (list[int], optional): List containing the rotation degree to be applied to the image. Defaults to [90].
     """        
+    stateless = True
+
     def __init__(self, degrees_list: List[int]=[90]):
         self.degrees_list = degrees_list
 
+    def cache_parameters(self) -> dict:
+        return {'degrees_list': list(self.degrees_list)}
+
     def __call__(self, image: npt.ArrayLike, padding: bool=False) -> List[npt.ArrayLike]:
         rotated_images = []
         for rotation_degree in self.degrees_list:
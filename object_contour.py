@@ -13,10 +13,11 @@ if __name__ == '__main__':
     ap.add_argument('-i', '--image_source', default=None, help='Path to image')
     ap.add_argument('-l', '--lower', type=int, default=30, help='Lower threshold to Canny Contour detector.')
     ap.add_argument('-t', '--higher', type=int, default=155, help='Higher threshold to Canny Contour detector.')
+    ap.add_argument('-w', '--workers', type=int, default=None, help='Process video frames in parallel with this number of worker processes.')
     args = vars(ap.parse_args())
 
     transformer = ObjectContourImageTransformation()
     if args['image_source']:
         AppController(source=args['image_source'], image_transformation=transformer, video=False, transformation_kw=dict(lower_threshold=args['lower'], higher_threshold=args['higher']))
     else:
-        AppController(source=0, image_transformation=transformer, transformation_kw=dict(lower_threshold=args['lower'], higher_threshold=args['higher']))
\ No newline at end of file
+        AppController(source=0, image_transformation=transformer, transformation_kw=dict(lower_threshold=args['lower'], higher_threshold=args['higher']), n_workers=args['workers'])
\ No newline at end of file
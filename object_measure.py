@@ -6,15 +6,25 @@
 
 import argparse
 from models import ObjectMeasureImageTransformation
-from controller import AppController
+from controller import AppController, DatasetController, SQLiteResultSink, ResolutionGovernor
     
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('-i', '--image_source', default=None, help='Path to image')
+    ap.add_argument('-d', '--dataset_dir', default=None, help='Directory of images to be processed without display')
+    ap.add_argument('-o', '--output', type=str, default='results.sqlite', help='SQLite database receiving the results of the images in dataset_dir')
+    ap.add_argument('--target_fps', type=float, default=None, help='Adapt the processing resolution of videos to hold this frame rate.')
+    ap.add_argument('--target_latency', type=float, default=None, help='Adapt the processing resolution of videos to hold this p95 latency (ms).')
     args = vars(ap.parse_args())
 
     transformer = ObjectMeasureImageTransformation()
-    if args['image_source']:
+    controller_kw = {}
+    if args['target_fps'] or args['target_latency']:
+        controller_kw['resolution_governor'] = ResolutionGovernor(target_fps=args['target_fps'], target_latency=args['target_latency'])
+    if args['dataset_dir']:
+        with SQLiteResultSink(args['output']) as sink:
+            DatasetController(source=args['dataset_dir'], image_transformation=transformer, result_callback=sink.result_callback('measurements'))
+    elif args['image_source']:
         AppController(source=args['image_source'], image_transformation=transformer, video=False)
     else:
-        AppController(source=0, image_transformation=transformer)
\ No newline at end of file
+        AppController(source=0, image_transformation=transformer, controller_kw=controller_kw)
\ No newline at end of file
@@ -6,18 +6,26 @@
 
 import argparse
 from models import ObjectTrackingImageTransformation
-from controller import AppController
+from controller import AppController, ResolutionGovernor
     
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('-i', '--image_source', default=None, help='Path to image')
+    ap.add_argument('-v', '--video_sources', nargs='+', default=['0'], help='Webcam indexes or video paths, separated by blank space. Multiple sources share the same model. e.g: 0 1 video.mp4')
     ap.add_argument('-b', '--buffer_size', default=64, type=int, help='Size of the buffer to define trace lenght.')
     ap.add_argument('-l', '--hsv_min', nargs=3, default=(115, 33, 65), type=int, help='Minimum HSV to object identification. (Define using imutils/bin/range-detector)')
     ap.add_argument('-t', '--hsv_max', nargs=3, default=(174, 174, 248), type=int, help='Maximum HSV to object identification. (Define using imutils/bin/range-detector)')
+    ap.add_argument('--target_fps', type=float, default=None, help='Adapt the processing resolution of videos to hold this frame rate.')
+    ap.add_argument('--target_latency', type=float, default=None, help='Adapt the processing resolution of videos to hold this p95 latency (ms).')
     args = vars(ap.parse_args())
+    video_sources = [int(source) if source.isdigit() else source for source in args['video_sources']]
+    video_source = video_sources if len(video_sources) > 1 else video_sources[0]
 
     transformer = ObjectTrackingImageTransformation(buffer_size=args['buffer_size'], hsv_min=tuple(args['hsv_min']), hsv_max=tuple(args['hsv_max']))
+    controller_kw = {}
+    if args['target_fps'] or args['target_latency']:
+        controller_kw['resolution_governor'] = ResolutionGovernor(target_fps=args['target_fps'], target_latency=args['target_latency'])
     if args['image_source']:
         AppController(source=args['image_source'], image_transformation=transformer, video=False)
     else:
-        AppController(source=0, image_transformation=transformer)
\ No newline at end of file
+        AppController(source=video_source, image_transformation=transformer, controller_kw=controller_kw)
\ No newline at end of file